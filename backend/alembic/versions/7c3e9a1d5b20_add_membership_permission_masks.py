@@ -0,0 +1,40 @@
+"""add membership permission masks
+
+Revision ID: 7c3e9a1d5b20
+Revises: 41ab16c275ff
+Create Date: 2026-10-17 09:12:44.103512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1d5b20'
+down_revision: Union[str, None] = '41ab16c275ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bit position of each permission inside its organization's masks
+    op.add_column('permissions', sa.Column('bit_position', sa.Integer(), nullable=True))
+
+    # Compiled effective permissions per (user, organization); populated lazily
+    op.create_table('membership_permission_masks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('mask', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'organization_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('membership_permission_masks')
+    op.drop_column('permissions', 'bit_position')
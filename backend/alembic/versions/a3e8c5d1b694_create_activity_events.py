@@ -0,0 +1,42 @@
+"""create activity events
+
+Revision ID: a3e8c5d1b694
+Revises: f2a9d6c4b871
+Create Date: 2026-10-17 14:21:07.583162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e8c5d1b694'
+down_revision: Union[str, None] = 'f2a9d6c4b871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE activity_events_id_seq")
+    op.create_table('activity_events',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('activity_events_id_seq')"), nullable=False),
+        sa.Column('ts', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'ts'),
+        postgresql_partition_by='RANGE (ts)'
+    )
+    op.create_index('ix_activity_events_org_user_ts', 'activity_events', ['organization_id', 'user_id', 'ts', 'id'])
+    # Catch-all for rows outside the monthly partitions the writer creates
+    op.execute("CREATE TABLE activity_events_default PARTITION OF activity_events DEFAULT")
+    op.execute("ALTER SEQUENCE activity_events_id_seq OWNED BY activity_events.id")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activity_events_org_user_ts', table_name='activity_events')
+    op.drop_table('activity_events')
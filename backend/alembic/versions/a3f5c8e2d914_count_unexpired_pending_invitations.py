@@ -0,0 +1,43 @@
+"""count unexpired pending invitations on read
+
+Revision ID: a3f5c8e2d914
+Revises: d8b2e6f4a517
+Create Date: 2026-10-18 09:12:35.207441
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f5c8e2d914'
+down_revision: Union[str, None] = 'd8b2e6f4a517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expiry happens without a write, so the counter counted expired
+    # invitations; they are now counted on read over the unexpired rows
+    op.execute("DELETE FROM stats_counters WHERE name = 'pending_invitations'")
+    with op.get_context().autocommit_block():
+        # A leftover from an interrupted build would be INVALID
+        op.drop_index('ix_invitations_pending_expires_org', table_name='invitations', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_invitations_pending_expires_org', 'invitations', ['expires_at', 'organization_id'],
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('is_accepted = false'),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_invitations_pending_expires_org', table_name='invitations', postgresql_concurrently=True, if_exists=True)
+    op.execute("""
+        INSERT INTO stats_counters (organization_id, name, value, created_at, updated_at)
+        SELECT organization_id, 'pending_invitations', COUNT(*), NOW(), NOW() FROM invitations
+        WHERE is_accepted IS NOT TRUE
+        GROUP BY organization_id
+    """)
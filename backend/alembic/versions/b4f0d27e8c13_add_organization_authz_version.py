@@ -0,0 +1,27 @@
+"""add organization authz version
+
+Revision ID: b4f0d27e8c13
+Revises: 7c3e9a1d5b20
+Create Date: 2026-10-17 10:02:19.550871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f0d27e8c13'
+down_revision: Union[str, None] = '7c3e9a1d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Counter bumped by every role, permission and membership change
+    op.add_column('organizations', sa.Column('authz_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'authz_version')
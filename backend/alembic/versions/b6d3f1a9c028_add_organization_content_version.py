@@ -0,0 +1,27 @@
+"""add organization content version
+
+Revision ID: b6d3f1a9c028
+Revises: a3e8c5d1b694
+Create Date: 2026-10-17 15:04:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d3f1a9c028'
+down_revision: Union[str, None] = 'a3e8c5d1b694'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Counter bumped by every write to an organization's tenant-scoped content
+    op.add_column('organizations', sa.Column('content_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'content_version')
@@ -0,0 +1,36 @@
+"""drop global stats totals of per-organization counters
+
+Revision ID: d8b2e6f4a517
+Revises: c4a7e2f9b130
+Create Date: 2026-10-17 17:05:42.318860
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b2e6f4a517'
+down_revision: Union[str, None] = 'c4a7e2f9b130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # These totals are now summed from the organizations' rows on read
+    op.execute("""
+        DELETE FROM stats_counters
+        WHERE organization_id = 0
+          AND name IN ('roles', 'pending_join_requests', 'pending_invitations')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        INSERT INTO stats_counters (organization_id, name, value, created_at, updated_at)
+        SELECT 0, name, SUM(value), NOW(), NOW() FROM stats_counters
+        WHERE organization_id <> 0
+          AND name IN ('roles', 'pending_join_requests', 'pending_invitations')
+        GROUP BY name
+    """)
@@ -0,0 +1,86 @@
+"""add hot lookup indexes
+
+Revision ID: e7c14b9a3d52
+Revises: d5a72c9e1f46
+Create Date: 2026-10-17 12:41:27.603915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c14b9a3d52'
+down_revision: Union[str, None] = 'd5a72c9e1f46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, unique, partial predicate)
+INDEXES = [
+    ('uix_user_organization', 'user_organizations', ['user_id', 'organization_id'], True, None),
+    ('ix_user_organizations_organization_id_role_id', 'user_organizations', ['organization_id', 'role_id'], False, None),
+    ('ix_invitations_organization_id', 'invitations', ['organization_id'], False, None),
+    ('ix_invitations_pending_org_email_expires', 'invitations', ['organization_id', 'email', 'expires_at'], False, 'is_accepted = false'),
+    ('ix_join_requests_organization_id_status', 'join_requests', ['organization_id', 'status'], False, None),
+    ('ix_join_requests_user_id_organization_id', 'join_requests', ['user_id', 'organization_id'], False, None),
+    ('ix_roles_organization_id', 'roles', ['organization_id'], False, None),
+    ('ix_permissions_organization_id', 'permissions', ['organization_id'], False, None),
+    ('ix_user_roles_role_id', 'user_roles', ['role_id'], False, None),
+    ('ix_role_permissions_permission_id', 'role_permissions', ['permission_id'], False, None),
+]
+
+ASSOCIATION_PRIMARY_KEYS = {
+    'user_roles': ['user_id', 'role_id'],
+    'role_permissions': ['role_id', 'permission_id'],
+}
+
+
+def _dedupe(table: str, columns: Sequence[str], tiebreak: str) -> None:
+    """Keep one row per `columns`, the one with the lowest `tiebreak`"""
+    matches = ' AND '.join(f'a.{column} = b.{column}' for column in columns)
+    op.execute(f'DELETE FROM {table} a USING {table} b WHERE {matches} AND a.{tiebreak} > b.{tiebreak}')
+
+
+def _invalid_indexes() -> Sequence[str]:
+    """Indexes left INVALID by an interrupted concurrent build"""
+    return op.get_bind().execute(
+        sa.text(
+            'SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE NOT i.indisvalid AND c.relname IN :names'
+        ).bindparams(sa.bindparam('names', expanding=True)),
+        {'names': [name for name, *_ in INDEXES]}
+    ).scalars().all()
+
+
+def upgrade() -> None:
+    # The old models allowed duplicate memberships and association rows,
+    # which would fail the unique index and primary keys below
+    _dedupe('user_organizations', ['user_id', 'organization_id'], 'id')
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in ASSOCIATION_PRIMARY_KEYS.items():
+        # Tables created with create_all from the old models have no primary key
+        if not inspector.get_pk_constraint(table).get('constrained_columns'):
+            _dedupe(table, columns, 'ctid')
+            op.create_primary_key(f'{table}_pkey', table, columns)
+
+    # Build the indexes without blocking writes to the tables
+    with op.get_context().autocommit_block():
+        # if_not_exists would skip an INVALID leftover forever; rebuild it
+        for name in _invalid_indexes():
+            op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+        for name, table, columns, unique, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
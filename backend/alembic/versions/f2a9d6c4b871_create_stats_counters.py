@@ -0,0 +1,57 @@
+"""create stats counters
+
+Revision ID: f2a9d6c4b871
+Revises: e7c14b9a3d52
+Create Date: 2026-10-17 13:08:44.215370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9d6c4b871'
+down_revision: Union[str, None] = 'e7c14b9a3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stats_counters',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('organization_id', 'name')
+    )
+    # Backfill from the current data; organization_id 0 holds the global totals
+    op.execute("""
+        INSERT INTO stats_counters (organization_id, name, value, created_at, updated_at)
+        SELECT 0, 'users', COUNT(*), NOW(), NOW() FROM users
+        UNION ALL
+        SELECT 0, 'organizations', COUNT(*), NOW(), NOW() FROM organizations
+        UNION ALL
+        SELECT 0, 'roles', COUNT(*), NOW(), NOW() FROM roles
+        UNION ALL
+        SELECT 0, 'pending_join_requests', COUNT(*), NOW(), NOW() FROM join_requests WHERE status = 'pending'
+        UNION ALL
+        SELECT 0, 'pending_invitations', COUNT(*), NOW(), NOW() FROM invitations WHERE is_accepted IS NOT TRUE
+        UNION ALL
+        SELECT organization_id, 'members', COUNT(*), NOW(), NOW() FROM user_organizations
+        WHERE organization_id IS NOT NULL GROUP BY organization_id
+        UNION ALL
+        SELECT organization_id, 'roles', COUNT(*), NOW(), NOW() FROM roles GROUP BY organization_id
+        UNION ALL
+        SELECT organization_id, 'pending_join_requests', COUNT(*), NOW(), NOW() FROM join_requests
+        WHERE status = 'pending' AND organization_id IS NOT NULL GROUP BY organization_id
+        UNION ALL
+        SELECT organization_id, 'pending_invitations', COUNT(*), NOW(), NOW() FROM invitations
+        WHERE is_accepted IS NOT TRUE GROUP BY organization_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('stats_counters')
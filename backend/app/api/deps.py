@@ -1,12 +1,13 @@
-from typing import Generator, Optional
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import get_db
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
@@ -14,17 +15,13 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(reusable_oauth2)
 ) -> User:
+    user = principal_cache.load(db, token)
+    if user is not None:
+        return user
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=["HS256"]
@@ -40,6 +37,7 @@ def get_current_user(
         raise HTTPException(
             status_code=404, detail="User not found"
         )
+    principal_cache.store(token, user, expires_at=payload.get("exp"))
     return user
 
 def get_current_active_user(
@@ -0,0 +1,113 @@
+import logging
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import TTLCache, principal_cache
+from app.core.hashing import password_hash_seconds, password_hash_wait_seconds, password_hasher
+from app.core.response_cache import response_cache
+from app.core.metrics import (
+    http_request_seconds,
+    http_requests,
+    pool_wait_seconds,
+    render_counter,
+    render_gauge,
+    render_histogram,
+)
+from app.core.query_stats import route_query_counts, route_query_seconds
+from app.db.session import SessionLocal, async_engine, engine
+from app.utils.activity import activity_buffer
+from app.utils.outbox import pending_count
+from app.utils.permission_index import permission_decisions
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# The outbox depth is a COUNT query; scrapes within this window reuse it
+OUTBOX_DEPTH_TTL_SECONDS = 15
+_outbox_depth = TTLCache(maxsize=1, ttl=OUTBOX_DEPTH_TTL_SECONDS)
+
+
+def _pool_lines() -> List[str]:
+    samples = {"checked_out": {}, "overflow": {}, "size": {}}
+    for label, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        for name, method in (("checked_out", "checkedout"), ("overflow", "overflow"), ("size", "size")):
+            if hasattr(pool, method):
+                samples[name][(label,)] = getattr(pool, method)()
+    return (
+        render_gauge("db_pool_checked_out_connections", "Connections currently checked out of the pool", samples["checked_out"], ("engine",))
+        + render_gauge("db_pool_overflow_connections", "Connections open beyond the pool size", samples["overflow"], ("engine",))
+        + render_gauge("db_pool_size", "Configured pool size", samples["size"], ("engine",))
+        + render_histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection", ("engine",), pool_wait_seconds)
+    )
+
+
+def _outbox_lines() -> List[str]:
+    depth = _outbox_depth.get("pending")
+    if depth is None:
+        db = SessionLocal()
+        try:
+            depth = pending_count(db)
+        except SQLAlchemyError:
+            logger.warning("Could not read email outbox depth", exc_info=True)
+            return []
+        finally:
+            db.close()
+        _outbox_depth.set("pending", depth)
+    return render_gauge("email_outbox_pending", "Emails waiting for delivery", {(): depth})
+
+
+def _cache_lines() -> List[str]:
+    caches = {
+        ("principal",): principal_cache.stats(),
+        ("permission_decision",): permission_decisions.stats(),
+        ("response",): response_cache.stats(),
+    }
+    return (
+        render_gauge("cache_hit_ratio", "Hits over lookups since start", {labels: stats["hit_ratio"] for labels, stats in caches.items()}, ("cache",))
+        + render_gauge("cache_entries", "Entries currently cached", {labels: stats["size"] for labels, stats in caches.items()}, ("cache",))
+        + render_counter("cache_evictions_total", "Entries evicted to stay within size", ("cache",), {labels: stats["evictions"] for labels, stats in caches.items()})
+    )
+
+
+def _hasher_lines() -> List[str]:
+    stats = password_hasher.stats()
+    return (
+        render_gauge("password_hash_running", "Password hashes running in a worker", {(): stats["running"]})
+        + render_gauge("password_hash_queued", "Password hashes waiting for a free worker", {(): stats["queue_depth"]})
+        + render_histogram("password_hash_duration_seconds", "Time a hash spent in a worker", (), password_hash_seconds)
+        + render_histogram("password_hash_queue_wait_seconds", "Time a hash waited for a worker", (), password_hash_wait_seconds)
+        + render_counter("password_hash_rejected_total", "Password hashes rejected with 503", (), {(): stats["rejected"]})
+    )
+
+
+def _activity_lines() -> List[str]:
+    stats = activity_buffer.stats()
+    return (
+        render_gauge("activity_buffered_events", "Activity events waiting for the batch writer", {(): stats["buffered"]})
+        + render_counter("activity_dropped_events_total", "Activity events dropped because the buffer was full", (), {(): stats["dropped"]})
+        + render_counter("activity_written_events_total", "Activity events written to the database", (), {(): stats["written"]})
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    labels = ("method", "route", "status")
+    lines = (
+        render_counter("http_requests_total", "Requests handled", labels, http_requests)
+        + render_histogram("http_request_duration_seconds", "Request latency", labels, http_request_seconds)
+        + render_histogram("http_request_db_queries", "SQL statements per request", ("method", "route"), route_query_counts)
+        + render_histogram("http_request_db_seconds", "Database time per request", ("method", "route"), route_query_seconds)
+        + _pool_lines()
+        + _outbox_lines()
+        + _cache_lines()
+        + _hasher_lines()
+        + _activity_lines()
+    )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
@@ -6,7 +6,9 @@ from app.api.v1.endpoints import (
     organizations,
     roles,
     permissions,
-    members
+    members,
+    jobs,
+    dashboard
 )
 
 api_router = APIRouter()
@@ -17,3 +19,5 @@ api_router.include_router(organizations.router, prefix="/organizations", tags=["
 api_router.include_router(roles.router, prefix="/organizations/{organization_id}/roles", tags=["roles"])
 api_router.include_router(permissions.router, prefix="/organizations/{organization_id}/permissions", tags=["permissions"])
 api_router.include_router(members.router, prefix="/organizations/{organization_id}/members", tags=["members"])
+api_router.include_router(jobs.router, prefix="/organizations/{organization_id}/jobs", tags=["jobs"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
@@ -2,6 +2,7 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Body, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud
@@ -11,30 +12,33 @@ from app.schemas.user import User as UserSchema, UserCreate
 from app.schemas.msg import Msg
 from app.api import deps
 from app.core import security
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.security import hash_password_async
 from app.utils import (
     generate_password_reset_token,
     verify_password_reset_token,
-    send_reset_password_email,
 )
+from app.utils.outbox import enqueue_email
+from app.db.session import get_async_db
+from app.db.uow import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(get_async_db),
     login_data: LoginRequest,
 ) -> Any:
     """
     Login with email and password, get an access token for future requests
     """
-    user = crud.user.authenticate(
+    user = await crud.user.authenticate_async(
         db, email=login_data.email, password=login_data.password
     )
     if not user:
@@ -80,16 +84,16 @@ def recover_password(email: str, db: Session = Depends(deps.get_db)) -> Any:
             detail="The user with this email does not exist in the system",
         )
     password_reset_token = generate_password_reset_token(email=email)
-    send_reset_password_email(
-        email_to=user.email, email=email, token=password_reset_token
+    enqueue_email(
+        db, "reset_password", user.email, email=email, token=password_reset_token
     )
     return {"msg": "Password recovery email sent"}
 
 @router.post("/reset-password/", response_model=Msg)
-def reset_password(
+async def reset_password(
     token: str = Body(...),
     new_password: str = Body(...),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Reset password
@@ -97,7 +101,7 @@ def reset_password(
     email = verify_password_reset_token(token)
     if not email:
         raise HTTPException(status_code=400, detail="Invalid token")
-    user = crud.user.get_by_email(db, email=email)
+    user = await crud.user.get_by_email_async(db, email=email)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -105,8 +109,8 @@ def reset_password(
         )
     elif not crud.user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await hash_password_async(new_password)
     user.hashed_password = hashed_password
     db.add(user)
-    db.commit()
+    principal_cache.evict_user_on_commit(db.sync_session, user.id)
     return {"msg": "Password updated successfully"}
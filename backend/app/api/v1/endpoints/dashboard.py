@@ -1,39 +1,49 @@
-from typing import Any, List
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from app import crud, models
 from app.api import deps
+from app.db.uow import UnitOfWorkRoute
+from app.models.stats_counter import GLOBAL_SCOPE
 from app.models.user import User
-from app.models.organization import Organization
 from app.models.user_organization import UserOrganization
+from app.utils.stats import count_pending_invitations, read_counters
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/stats")
 def get_dashboard_stats(
+    organization_id: Optional[int] = None,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Get dashboard statistics
+    Get dashboard statistics.
+    Reads the maintained stats counters, so the cost does not grow with the
+    data; pending invitations are counted over the unexpired ones. Pass `organization_id` for one organization's numbers.
     """
-    # Get total users count
-    total_users = db.query(func.count(User.id)).scalar()
-
-    # Get total organizations count
-    total_organizations = db.query(func.count(Organization.id)).scalar()
-
-    # Get total roles (unique roles across all organizations)
-    total_roles = db.query(func.count(func.distinct(UserOrganization.role))).scalar()
-
-    # Get pending requests count (placeholder for now)
-    pending_requests = 0
+    if organization_id is None:
+        counters = read_counters(db, GLOBAL_SCOPE)
+        return {
+            "total_users": counters.get("users", 0),
+            "total_organizations": counters.get("organizations", 0),
+            "total_roles": counters.get("roles", 0),
+            "pending_requests": counters.get("pending_join_requests", 0),
+            "pending_invitations": count_pending_invitations(db),
+        }
 
+    is_member = db.query(
+        db.query(UserOrganization).filter(
+            UserOrganization.user_id == current_user.id,
+            UserOrganization.organization_id == organization_id
+        ).exists()
+    ).scalar()
+    if not is_member and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="User does not belong to this organization")
+    counters = read_counters(db, organization_id)
     return {
-        "total_users": total_users,
-        "total_organizations": total_organizations,
-        "total_roles": total_roles,
-        "pending_requests": pending_requests
+        "total_members": counters.get("members", 0),
+        "total_roles": counters.get("roles", 0),
+        "pending_requests": counters.get("pending_join_requests", 0),
+        "pending_invitations": count_pending_invitations(db, organization_id),
     }
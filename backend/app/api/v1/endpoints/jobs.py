@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_current_user
+from app.models.user import User
+from app.models.job import Job
+from app.schemas.job import JobResponse
+from app.db.uow import UnitOfWorkRoute
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def read_job(
+    job_id: int,
+    organization_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Poll the status, progress and result of a background job"""
+    job = db.query(Job).filter(
+        Job.id == job_id,
+        Job.organization_id == organization_id
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.created_by_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return job
@@ -5,10 +5,12 @@ from datetime import datetime
 
 from app.core.deps import get_db, get_current_user
 from app.models.join_request import JoinRequest
-from app.models.organization_member import OrganizationMember
+from app.models.organization import Organization
+from app.models.user_organization import UserOrganization
 from app.models.user import User
 from app.schemas.join_request import JoinRequestCreate, JoinRequest as JoinRequestSchema, JoinRequestUpdate
-from app.utils.email import send_join_request_notification, send_join_request_status_update
+from app.utils.outbox import enqueue_email
+from app.utils.permission_index import rebuild_membership
 
 router = APIRouter()
 
@@ -21,9 +23,9 @@ async def create_join_request(
 ):
     """Create a new join request"""
     # Check if user is already a member
-    existing_member = db.query(OrganizationMember).filter(
-        OrganizationMember.user_id == current_user.id,
-        OrganizationMember.organization_id == org_id
+    existing_member = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
     ).first()
     
     if existing_member:
@@ -52,24 +54,26 @@ async def create_join_request(
         status="pending"
     )
     db.add(join_request)
-    db.commit()
-    db.refresh(join_request)
 
-    # Notify organization admins
+    # Notify organization admins through the outbox, in the same transaction
     organization = db.query(Organization).filter(Organization.id == org_id).first()
-    admins = db.query(User).join(OrganizationMember).filter(
-        OrganizationMember.organization_id == org_id,
-        OrganizationMember.role.has(name="admin")
+    admins = db.query(User).join(UserOrganization).filter(
+        UserOrganization.organization_id == org_id,
+        UserOrganization.role.has(name="admin")
     ).all()
 
     for admin in admins:
-        background_tasks.add_task(
-            send_join_request_notification,
+        enqueue_email(
+            db,
+            "join_request_notification",
             admin.email,
-            current_user.full_name,
-            organization.name
+            user_name=current_user.full_name,
+            organization_name=organization.name
         )
 
+    db.commit()
+    db.refresh(join_request)
+
     return join_request
 
 @router.get("/{org_id}/join-requests", response_model=List[JoinRequestSchema])
@@ -116,27 +120,30 @@ async def update_join_request(
 
     if request_update.status == "approved":
         # Add user to organization
-        member = OrganizationMember(
+        member = UserOrganization(
             user_id=join_request.user_id,
             organization_id=org_id,
             role_id=request_update.role_id  # Default role for new members
         )
         db.add(member)
+        db.flush()
+        rebuild_membership(db, join_request.user_id, org_id)
 
-    db.commit()
-    db.refresh(join_request)
-
-    # Notify user of the status update
+    # Notify user of the status update through the outbox
     user = db.query(User).filter(User.id == join_request.user_id).first()
     organization = db.query(Organization).filter(Organization.id == org_id).first()
     
-    background_tasks.add_task(
-        send_join_request_status_update,
+    enqueue_email(
+        db,
+        "join_request_status",
         user.email,
-        organization.name,
-        request_update.status
+        organization_name=organization.name,
+        status=request_update.status
     )
 
+    db.commit()
+    db.refresh(join_request)
+
     return join_request
 
 @router.delete("/{org_id}/join-requests/{request_id}")
@@ -1,19 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response, UploadFile, File, status
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import and_, delete, exists, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.deps import get_async_db, require_permission, require_permission_async
+from app.db.session import SessionLocal
 from app.schemas.member import MemberCreate, MemberUpdate, MemberResponse, InvitationCreate
+from app.schemas.activity import ActivityEventResponse
+from app.models.activity_event import ActivityEvent
 from app.models.user_organization import UserOrganization
 from app.models.role import Role
 from app.models.user import User
-from app.core.security import get_password_hash
-from app.utils.email import send_invitation_email
-from app.utils.permissions import check_permission
+from app.models.enums import UserStatus
+from app.core.security import hash_password_async, hash_passwords_async
+from app.core.responses import rows_response
+from app.utils.activity import log_activity
+from app.utils.content_version import check_not_modified_async, touch_organization
+from app.utils.fieldsets import FIELDS_QUERY, parse_fields
+from app.utils.jobs import job_handler, submit_job
+from app.utils.outbox import enqueue_email
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.permission_index import rebuild_membership, rebuild_organization, remove_membership
+from app.utils.stats import bump_counters
+from app.db.uow import UnitOfWorkRoute
 from datetime import datetime, timedelta
+import csv
+import io
+import json
 import secrets
 import string
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+EMAIL_ADAPTER = TypeAdapter(EmailStr)
+
+BULK_ACTIONS = {"delete", "update_roles", "activate", "deactivate"}
+BULK_CHUNK_SIZE = 1000
+
+IMPORT_BATCH_SIZE = 500
+
+MEMBERS_PAGE_SIZE = 50
+MEMBERS_MAX_PAGE_SIZE = 500
+
+# Fields selectable with `fields=` on list_members, and the columns behind them
+MEMBER_FIELDS = frozenset(MemberResponse.model_fields)
+MEMBER_COLUMNS = {
+    "email": User.email,
+    "full_name": User.full_name,
+    "is_active": User.is_active,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+
+# Activity action recorded for each bulk action
+BULK_ACTIVITY = {
+    "delete": "member.removed",
+    "update_roles": "member.roles_updated",
+    "activate": "member.activated",
+    "deactivate": "member.deactivated",
+}
+
+# Keyset sort keys; nullable columns are coalesced so the keyset stays total
+MEMBER_SORT_COLUMNS = {
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+    "email": User.email,
+    "full_name": func.coalesce(User.full_name, ""),
+}
 
 def generate_temp_password(length=12):
     """Generate a secure temporary password"""
@@ -23,83 +81,228 @@ def generate_temp_password(length=12):
 @router.get("/", response_model=List[MemberResponse])
 async def list_members(
     organization_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("view_members")),
     search: Optional[str] = None,
     role: Optional[str] = None,
     status: Optional[str] = None,
     sort_by: Optional[str] = "created_at",
-    order: Optional[str] = "desc"
+    order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
+    limit: int = Query(MEMBERS_PAGE_SIZE, ge=1, le=MEMBERS_MAX_PAGE_SIZE),
+    fields: Optional[str] = FIELDS_QUERY
 ):
-    """List all members in an organization with advanced filtering"""
-    check_permission(current_user, organization_id, "view_members")
+    """
+    List members in an organization with advanced filtering.
+    Results are keyset-paginated on (sort_by, id); pass the `X-Next-Cursor`
+    response header back as `cursor` to fetch the next page. Roles are only
+    joined when `roles` is among the requested `fields`.
+    """
+    selected = parse_fields(fields, MEMBER_FIELDS)
+    wanted = MEMBER_FIELDS if selected is None else selected
+    if sort_by not in MEMBER_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort members by {sort_by}")
+    await check_not_modified_async(db, request, response, organization_id)
+    sort_column = MEMBER_SORT_COLUMNS[sort_by]
+    descending = order == "desc"
     
-    # Query users with their organization memberships
-    query = (
-        db.query(User, UserOrganization)
-        .join(UserOrganization)
-        .filter(UserOrganization.organization_id == organization_id)
+    # Page of distinct member ids, selected by keyset
+    page = (
+        select(User.id.label("id"), sort_column.label("sort_key"))
+        .filter(
+            exists().where(
+                UserOrganization.user_id == User.id,
+                UserOrganization.organization_id == organization_id
+            )
+        )
     )
     
     if search:
-        query = query.filter(
+        page = page.filter(
             (User.full_name.ilike(f"%{search}%")) |
             (User.email.ilike(f"%{search}%"))
         )
     
     if role:
-        query = query.join(Role, UserOrganization.role_id == Role.id).filter(Role.name == role)
+        role_membership = aliased(UserOrganization)
+        membership_role = aliased(Role)
+        page = page.filter(
+            exists().where(
+                role_membership.user_id == User.id,
+                role_membership.organization_id == organization_id,
+                role_membership.role_id == membership_role.id,
+                membership_role.name == role
+            )
+        )
         
     if status:
-        query = query.filter(User.status == status)
-        
-    if order == "desc":
-        query = query.order_by(getattr(User, sort_by).desc())
+        page = page.filter(User.status == status)
+    
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("sort_by") != sort_by or position.get("order") != order:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested ordering")
+        if "value" not in position or isinstance(position["value"], (dict, list)) or not isinstance(position.get("id"), int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = tuple_(sort_column, User.id)
+        boundary = tuple_(literal(position["value"]), literal(position["id"]))
+        page = page.filter(after < boundary if descending else after > boundary)
+    
+    if descending:
+        page = page.order_by(sort_column.desc(), User.id.desc())
     else:
-        query = query.order_by(getattr(User, sort_by).asc())
-        
-    results = query.all()
+        page = page.order_by(sort_column.asc(), User.id.asc())
+    page = page.limit(limit + 1).subquery()
     
-    # Transform the results into the response format
-    members = []
-    for user, user_org in results:
-        # Get the roles for this user in this organization
-        roles = (
-            db.query(Role)
-            .join(UserOrganization, UserOrganization.role_id == Role.id)
-            .filter(
-                UserOrganization.user_id == user.id,
+    # One statement: the page's requested columns, joined to each member's
+    # role(s) in this organization when asked for, ordered so a member's
+    # rows are adjacent.
+    columns = [column.label(name) for name, column in MEMBER_COLUMNS.items() if name in wanted]
+    query = select(User.id, page.c.sort_key, *columns).join(page, page.c.id == User.id)
+    with_roles = "roles" in wanted
+    if with_roles:
+        query = (
+            query.add_columns(Role.id.label("role_id"), Role.name.label("role_name"))
+            .join(UserOrganization, and_(
+                UserOrganization.user_id == User.id,
                 UserOrganization.organization_id == organization_id
-            )
-            .all()
+            ))
+            .outerjoin(Role, UserOrganization.role_id == Role.id)
         )
-        
-        # Create member response with organization_id
-        member_dict = user.__dict__
-        member_dict["organization_id"] = organization_id
-        member_dict["roles"] = [{"id": role.id, "name": role.name} for role in roles]
-        members.append(member_dict)
+    constants = {"organization_id": organization_id, "last_active": None}
+    constants = {name: value for name, value in constants.items() if name in wanted}
+    if descending:
+        query = query.order_by(page.c.sort_key.desc(), User.id.desc())
+    else:
+        query = query.order_by(page.c.sort_key.asc(), User.id.asc())
+    
+    # Fold the role rows into one MemberResponse-shaped dict per member
+    members = {}
+    sort_keys = {}
+    for row in (await db.execute(query)).mappings():
+        member = members.get(row["id"])
+        if member is None:
+            member = members[row["id"]] = {"id": row["id"], **constants}
+            member.update((name, row[name]) for name in MEMBER_COLUMNS if name in wanted)
+            if with_roles:
+                member["roles"] = []
+            sort_keys[row["id"]] = row["sort_key"]
+        if with_roles and row["role_id"] is not None:
+            member["roles"].append({"id": row["role_id"], "name": row["role_name"]})
     
-    return [MemberResponse.from_orm(member) for member in members]
+    results = list(members.values())
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor({
+            "sort_by": sort_by,
+            "order": order,
+            "value": sort_keys[last["id"]],
+            "id": last["id"],
+        })
+    return rows_response(results, response, partial=selected is not None)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ["id", "email", "full_name", "is_active", "status", "created_at", "roles"]
+
+def _iter_export_members(organization_id: int) -> Iterator[dict]:
+    """Yield one dict per member, streaming rows from a server-side cursor"""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                User.id,
+                User.email,
+                User.full_name,
+                User.is_active,
+                User.status,
+                User.created_at,
+                Role.name.label("role_name"),
+            )
+            .join(UserOrganization, UserOrganization.user_id == User.id)
+            .outerjoin(Role, UserOrganization.role_id == Role.id)
+            .filter(UserOrganization.organization_id == organization_id)
+            .order_by(User.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        member = None
+        for row in rows:
+            if member is None or member["id"] != row.id:
+                if member is not None:
+                    yield member
+                member = {
+                    "id": row.id,
+                    "email": row.email,
+                    "full_name": row.full_name,
+                    "is_active": row.is_active,
+                    "status": row.status.value if row.status else None,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "roles": [],
+                }
+            if row.role_name is not None:
+                member["roles"].append(row.role_name)
+        if member is not None:
+            yield member
+    finally:
+        db.close()
+
+def _ndjson_lines(members: Iterator[dict]) -> Iterator[str]:
+    lines = []
+    for member in members:
+        lines.append(json.dumps(member))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+def _csv_lines(members: Iterator[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for member in members:
+        member["roles"] = ";".join(member["roles"])
+        writer.writerow([member[column] for column in EXPORT_COLUMNS])
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+@router.get("/export")
+def export_members(
+    organization_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(require_permission("view_members"))
+):
+    """Stream every member of the organization as NDJSON or CSV"""
+    members = _iter_export_members(organization_id)
+    if format == "csv":
+        return StreamingResponse(
+            _csv_lines(members),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="organization-{organization_id}-members.csv"'}
+        )
+    return StreamingResponse(_ndjson_lines(members), media_type="application/x-ndjson")
 
 @router.post("/invite")
 async def invite_member(
     organization_id: int,
     invitation: InvitationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("invite_members"))
 ):
     """Invite a new member to the organization"""
-    check_permission(current_user, organization_id, "invite_members")
-    
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == invitation.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == invitation.email))
     if existing_user:
         # Check if user is already in the organization
-        existing_membership = db.query(UserOrganization).filter(
+        existing_membership = await db.scalar(select(UserOrganization).where(
             UserOrganization.user_id == existing_user.id,
             UserOrganization.organization_id == organization_id
-        ).first()
+        ))
         if existing_membership:
             raise HTTPException(
                 status_code=400,
@@ -109,7 +312,7 @@ async def invite_member(
     else:
         # Generate a temporary password for the new user
         temp_password = generate_temp_password()
-        hashed_password = get_password_hash(temp_password)
+        hashed_password = await hash_password_async(temp_password)
         
         # Create new user
         user = User(
@@ -120,13 +323,13 @@ async def invite_member(
             full_name=""  # Empty string instead of null
         )
         db.add(user)
-        db.flush()
+        await db.flush()
     
     # Check if role exists and belongs to the organization
-    role = db.query(Role).filter(
+    role = await db.scalar(select(Role).where(
         Role.id == invitation.role_id,
         Role.organization_id == organization_id
-    ).first()
+    ))
     if not role:
         raise HTTPException(
             status_code=404,
@@ -140,122 +343,444 @@ async def invite_member(
         role_id=role.id
     )
     db.add(user_org)
+    await db.flush()
+    await db.run_sync(rebuild_membership, user.id, organization_id)
     
-    try:
-        db.commit()
-        # Send invitation email with the temporary password if it's a new user
-        if not existing_user:
-            await send_invitation_email(
-                user.email, 
-                current_user.full_name, 
-                organization_id,
-                temp_password  # Pass the temporary password to the email function
+    # Queue the invitation email in the same transaction as the membership;
+    # new users also receive their temporary password
+    enqueue_email(
+        db.sync_session,
+        "invitation",
+        user.email,
+        inviter_name=current_user.full_name,
+        org_id=organization_id,
+        temp_password=None if existing_user else temp_password
+    )
+    log_activity(
+        db.sync_session,
+        organization_id=organization_id,
+        user_id=user.id,
+        action="member.invited",
+        actor_id=current_user.id,
+        role_id=role.id
+    )
+    return {"message": "Invitation sent successfully"}
+
+@router.post("/import")
+async def import_members(
+    organization_id: int,
+    file: UploadFile = File(...),
+    default_role_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("invite_members"))
+):
+    """
+    Import members from a CSV upload with `email`, optional `full_name` and
+    optional `role` (role name) columns. Rows without a role use
+    `default_role_id`. The file is parsed incrementally and processed in
+    batches: existing users, memberships and roles are resolved with set-based
+    lookups, new users' temporary passwords are hashed in parallel, and users,
+    memberships and invitation emails are inserted per batch. A batch that
+    fails is retried row by row, and rows that still fail are reported as
+    skipped (`conflict`). The whole import commits as the request's unit
+    of work.
+    """
+    roles = (await db.execute(
+        select(Role.id, Role.name).where(Role.organization_id == organization_id)
+    )).all()
+    role_ids_by_name = {name.lower(): role_id for role_id, name in roles}
+    if default_role_id is not None and default_role_id not in role_ids_by_name.values():
+        raise HTTPException(
+            status_code=404,
+            detail="Role not found or does not belong to this organization"
+        )
+    
+    report = {"total_rows": 0, "created_users": 0, "added_members": 0, "skipped": []}
+    seen = set()
+    
+    async def add_batch(batch: List[dict]) -> tuple:
+        """Insert one batch; returns (skipped, created_users, added rows)"""
+        # Existing users keyed by lowercased email, matching the file's
+        # case-insensitive duplicate check
+        existing_users = dict((await db.execute(
+            select(func.lower(User.email), User.id).where(
+                func.lower(User.email).in_([row["key"] for row in batch])
+            )
+        )).all())
+        existing_members = set(await db.scalars(
+            select(UserOrganization.user_id).where(
+                UserOrganization.organization_id == organization_id,
+                UserOrganization.user_id.in_(existing_users.values())
+            )
+        ))
+        
+        skipped = []
+        to_add = []
+        for row in batch:
+            user_id = existing_users.get(row["key"])
+            if user_id is not None and user_id in existing_members:
+                skipped.append({"row": row["line"], "email": row["email"], "reason": "already_member"})
+            else:
+                to_add.append(row)
+        
+        created = []
+        new_rows = [row for row in to_add if row["key"] not in existing_users]
+        if new_rows:
+            temp_passwords = [generate_temp_password() for _ in new_rows]
+            hashed_passwords = await hash_passwords_async(temp_passwords)
+            created = (await db.execute(
+                insert(User).returning(User.id, User.email),
+                [
+                    {
+                        "email": row["email"],
+                        "hashed_password": hashed,
+                        "full_name": row["full_name"],
+                        "is_active": False,
+                        "status": UserStatus.INVITED,
+                    }
+                    for row, hashed in zip(new_rows, hashed_passwords)
+                ]
+            )).all()
+            existing_users.update({email.lower(): user_id for user_id, email in created})
+            await db.run_sync(bump_counters, users=len(created))
+            for row, temp_password in zip(new_rows, temp_passwords):
+                row["temp_password"] = temp_password
+        
+        if to_add:
+            await db.execute(
+                insert(UserOrganization),
+                [
+                    {
+                        "user_id": existing_users[row["key"]],
+                        "organization_id": organization_id,
+                        "role_id": row["role_id"],
+                    }
+                    for row in to_add
+                ]
+            )
+            await db.run_sync(bump_counters, organization_id, members=len(to_add))
+            for row in to_add:
+                row["user_id"] = existing_users[row["key"]]
+                enqueue_email(
+                    db.sync_session,
+                    "invitation",
+                    row["email"],
+                    inviter_name=current_user.full_name,
+                    org_id=organization_id,
+                    temp_password=row.get("temp_password")
+                )
+        return skipped, len(created), to_add
+    
+    async def process(batch: List[dict]) -> None:
+        # Each batch runs in a savepoint of the request's unit of work, so a
+        # failing batch is undone on its own and retried row by row
+        try:
+            async with db.begin_nested():
+                skipped, created_users, added = await add_batch(batch)
+        except IntegrityError:
+            # e.g. the email was registered concurrently since the lookup
+            if len(batch) == 1:
+                report["skipped"].append({"row": batch[0]["line"], "email": batch[0]["email"], "reason": "conflict"})
+                return
+            for row in batch:
+                row.pop("temp_password", None)
+                await process([row])
+            return
+        
+        report["skipped"].extend(skipped)
+        report["created_users"] += created_users
+        report["added_members"] += len(added)
+        if added:
+            touch_organization(db.sync_session, organization_id)
+        for row in added:
+            log_activity(
+                db.sync_session,
+                organization_id=organization_id,
+                user_id=row["user_id"],
+                action="member.imported",
+                actor_id=current_user.id,
+                role_id=row["role_id"]
+            )
+    
+    reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""))
+    if not reader.fieldnames or "email" not in reader.fieldnames:
+        raise HTTPException(status_code=400, detail="CSV must have an email column")
+    
+    batch = []
+    for line, record in enumerate(reader, start=2):
+        report["total_rows"] += 1
+        raw_email = (record.get("email") or "").strip()
+        try:
+            email = EMAIL_ADAPTER.validate_python(raw_email)
+        except ValidationError:
+            report["skipped"].append({"row": line, "email": raw_email, "reason": "invalid_email"})
+            continue
+        key = email.lower()
+        if key in seen:
+            report["skipped"].append({"row": line, "email": email, "reason": "duplicate_in_file"})
+            continue
+        seen.add(key)
+        
+        role_name = (record.get("role") or "").strip().lower()
+        role_id = role_ids_by_name.get(role_name) if role_name else default_role_id
+        if role_id is None:
+            report["skipped"].append({"row": line, "email": email, "reason": "unknown_role"})
+            continue
+        
+        batch.append({
+            "line": line,
+            "email": email,
+            "key": key,
+            "full_name": (record.get("full_name") or "").strip(),
+            "role_id": role_id,
+        })
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await process(batch)
+            batch = []
+    if batch:
+        await process(batch)
+    
+    if report["added_members"]:
+        await db.run_sync(rebuild_organization, organization_id)
+    return report
+
+@job_handler("members.bulk_action")
+def apply_bulk_action(db: Session, params: dict, progress=lambda done, total=None: None) -> dict:
+    """Apply a bulk member action with set-based statements over chunks of ids"""
+    organization_id = params["organization_id"]
+    member_ids = params["member_ids"]
+    action = params["action"]
+    data = params.get("data") or {}
+    actor_id = params.get("actor_id")
+    
+    role_id = None
+    if action == "update_roles":
+        role_id = db.query(Role.id).filter(
+            Role.id.in_(data.get("role_ids", [])),
+            Role.organization_id == organization_id
+        ).order_by(Role.id).limit(1).scalar()
+    
+    results = {}
+    requested = list(dict.fromkeys(member_ids))
+    for start in range(0, len(requested), BULK_CHUNK_SIZE):
+        chunk = requested[start:start + BULK_CHUNK_SIZE]
+        found = set(db.scalars(
+            select(UserOrganization.user_id).where(
+                UserOrganization.organization_id == organization_id,
+                UserOrganization.user_id.in_(chunk)
+            )
+        ))
+        for member_id in chunk:
+            results[member_id] = "affected" if member_id in found else "not_a_member"
+        if not found:
+            progress(start + len(chunk), len(requested))
+            continue
+        touch_organization(db, organization_id)
+        
+        if action == "delete":
+            db.execute(
+                delete(UserOrganization).where(
+                    UserOrganization.organization_id == organization_id,
+                    UserOrganization.user_id.in_(found)
+                ),
+                execution_options={"synchronize_session": False}
+            )
+            bump_counters(db, organization_id, members=-len(found))
+            remove_membership(db, list(found), organization_id)
+        elif action == "update_roles":
+            if role_id is None:
+                for member_id in found:
+                    results[member_id] = "invalid_role"
+                progress(start + len(chunk), len(requested))
+                continue
+            db.execute(
+                update(UserOrganization)
+                .where(
+                    UserOrganization.organization_id == organization_id,
+                    UserOrganization.user_id.in_(found)
+                )
+                .values(role_id=role_id),
+                execution_options={"synchronize_session": False}
             )
         else:
-            await send_invitation_email(
-                user.email,
-                current_user.full_name,
-                organization_id
+            # users.is_active is global; leave members of other organizations
+            # alone, since this organization's admins cannot speak for those
+            shared = set(db.scalars(
+                select(UserOrganization.user_id).distinct().where(
+                    UserOrganization.organization_id != organization_id,
+                    UserOrganization.user_id.in_(found)
+                )
+            ))
+            for member_id in shared:
+                results[member_id] = "other_memberships"
+            found -= shared
+            if not found:
+                progress(start + len(chunk), len(requested))
+                continue
+            db.execute(
+                update(User)
+                .where(User.id.in_(found))
+                .values(is_active=action == "activate"),
+                execution_options={"synchronize_session": False}
             )
-        return {"message": "Invitation sent successfully"}
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to send invitation: {str(e)}"
-        )
+            for member_id in found:
+                principal_cache.evict_user(member_id)
+        for member_id in found:
+            log_activity(
+                db,
+                organization_id=organization_id,
+                user_id=member_id,
+                action=BULK_ACTIVITY[action],
+                actor_id=actor_id,
+                **({"role_id": role_id} if action == "update_roles" else {})
+            )
+        progress(start + len(chunk), len(requested))
+    
+    if action == "update_roles" and role_id is not None:
+        rebuild_organization(db, organization_id)
+    
+    return {
+        "message": f"Bulk {action} completed successfully",
+        "affected": sum(1 for outcome in results.values() if outcome == "affected"),
+        "results": results
+    }
 
 @router.post("/bulk")
 async def bulk_action(
     organization_id: int,
+    response: Response,
     member_ids: List[int] = Body(...),
     action: str = Body(...),
     data: dict = Body(default={}),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("manage_members"))
 ):
-    """Perform bulk actions on members"""
-    check_permission(current_user, organization_id, "manage_members")
-    
-    members = db.query(User).join(UserOrganization).filter(
-        UserOrganization.organization_id == organization_id,
-        User.id.in_(member_ids)
-    ).all()
-    
-    if action == "delete":
-        for member in members:
-            db.query(UserOrganization).filter(
-                UserOrganization.user_id == member.id,
-                UserOrganization.organization_id == organization_id
-            ).delete()
-    elif action == "update_roles":
-        role_ids = data.get("role_ids", [])
-        roles = db.query(Role).filter(
-            Role.id.in_(role_ids),
-            Role.organization_id == organization_id
-        ).all()
-        for member in members:
-            member_org = db.query(UserOrganization).filter(
-                UserOrganization.user_id == member.id,
-                UserOrganization.organization_id == organization_id
-            ).first()
-            if member_org:
-                member_org.role_id = roles[0].id if roles else None
+    """
+    Perform bulk actions on members.
+    Supported actions are `delete`, `update_roles` (with `data.role_ids`),
+    `activate` and `deactivate`. Each is applied with set-based statements
+    over chunks of `member_ids` and reports an outcome per id. Account
+    status is global, so `activate` and `deactivate` skip members who also
+    belong to another organization (outcome `other_memberships`). Requests with
+    more than JOB_ASYNC_THRESHOLD ids run as a background job and return
+    202 Accepted with the job to poll.
+    """
+    if action not in BULK_ACTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported bulk action: {action}")
     
-    db.commit()
-    return {"message": f"Bulk {action} completed successfully"}
+    params = {
+        "organization_id": organization_id,
+        "member_ids": member_ids,
+        "action": action,
+        "data": data,
+        "actor_id": current_user.id,
+    }
+    if len(member_ids) > settings.JOB_ASYNC_THRESHOLD:
+        job = await db.run_sync(
+            lambda session: submit_job(
+                session,
+                organization_id=organization_id,
+                kind="members.bulk_action",
+                params=params,
+                created_by_id=current_user.id,
+                total=len(member_ids)
+            )
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "message": f"Bulk {action} accepted",
+            "job_id": job.id,
+            "status_url": f"{settings.API_V1_STR}/organizations/{organization_id}/jobs/{job.id}"
+        }
+    return await db.run_sync(apply_bulk_action, params)
 
 @router.put("/members/{member_id}/roles")
 async def update_member_roles(
     organization_id: int,
     member_id: int,
     role_ids: List[int] = Body(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("manage_members"))
 ):
     """Update member roles"""
-    check_permission(current_user, organization_id, "manage_members")
-    
-    member_org = db.query(UserOrganization).filter(
+    member_org = await db.scalar(select(UserOrganization).where(
         UserOrganization.user_id == member_id,
         UserOrganization.organization_id == organization_id
-    ).first()
+    ))
     
     if not member_org:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    roles = db.query(Role).filter(
+    roles = list(await db.scalars(select(Role).where(
         Role.id.in_(role_ids),
         Role.organization_id == organization_id
-    ).all()
+    )))
     
     if not roles:
         raise HTTPException(status_code=404, detail="No valid roles found")
     
     member_org.role_id = roles[0].id
-    db.commit()
+    await db.flush()
+    await db.run_sync(rebuild_membership, member_id, organization_id)
+    log_activity(
+        db.sync_session,
+        organization_id=organization_id,
+        user_id=member_id,
+        action="member.roles_updated",
+        actor_id=current_user.id,
+        role_id=member_org.role_id
+    )
     
     return {"message": "Member roles updated successfully"}
 
-@router.get("/members/{member_id}/activity")
+@router.get("/members/{member_id}/activity", response_model=List[ActivityEventResponse])
 async def get_member_activity(
     organization_id: int,
     member_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    limit: int = 10,
-    offset: int = 0
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    limit: int = Query(MEMBERS_PAGE_SIZE, ge=1, le=MEMBERS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission_async("view_members"))
 ):
-    """Get member activity history"""
-    check_permission(current_user, organization_id, "view_members")
-    
-    member = db.query(User).join(UserOrganization).filter(
-        UserOrganization.organization_id == organization_id,
-        User.id == member_id
-    ).first()
-    
-    if not member:
+    """
+    Get member activity history, newest first.
+    Results are keyset-paginated on (ts, id); when more results exist the
+    `X-Next-Cursor` response header holds the cursor for the next page.
+    Events appear once the background writer has flushed them, normally
+    within ACTIVITY_FLUSH_SECONDS. Former members' history, including their
+    `member.removed` event, stays readable.
+    """
+    known = await db.scalar(select(or_(
+        exists().where(
+            UserOrganization.organization_id == organization_id,
+            UserOrganization.user_id == member_id
+        ),
+        exists().where(
+            ActivityEvent.organization_id == organization_id,
+            ActivityEvent.user_id == member_id
+        )
+    )))
+    if not known:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    # TODO: Implement activity logging and retrieval
-    return []
+    query = select(ActivityEvent).where(
+        ActivityEvent.organization_id == organization_id,
+        ActivityEvent.user_id == member_id
+    )
+    if cursor:
+        position = decode_cursor(cursor)
+        if not isinstance(position.get("ts"), datetime) or not isinstance(position.get("id"), int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(ActivityEvent.ts, ActivityEvent.id)
+            < tuple_(literal(position["ts"]), literal(position["id"]))
+        )
+    events = list(await db.scalars(
+        query.order_by(ActivityEvent.ts.desc(), ActivityEvent.id.desc()).limit(limit + 1)
+    ))
+    
+    if len(events) > limit:
+        events = events[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor({"ts": events[-1].ts, "id": events[-1].id})
+    return events
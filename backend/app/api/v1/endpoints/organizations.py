@@ -1,5 +1,5 @@
-from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app import crud
@@ -8,28 +8,44 @@ from app.schemas.organization import Organization, OrganizationCreate, Organizat
 from app.schemas.invitation import InvitationCreate, InvitationResponse
 from app.schemas.join_request import JoinRequest, JoinRequestCreate
 from app.schemas.role import RoleCreate
-from app.utils import send_invitation_email
+from app.utils.outbox import enqueue_email
+from app.core.response_cache import permission_fingerprint, response_cache
+from app.core.responses import rows_response
+from app.utils.content_version import check_not_modified
+from app.utils.fieldsets import FIELDS_QUERY, parse_fields
 from app.api import deps
+from app.db.uow import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+# Fields selectable with `fields=` on the list endpoints
+ORGANIZATION_FIELDS = frozenset(Organization.model_fields)
+INVITATION_FIELDS = frozenset(InvitationResponse.model_fields)
 
 @router.get("/", response_model=List[Organization])
 def read_organizations(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = FIELDS_QUERY,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve organizations.
     If the user is superuser, return all organizations.
     If the user is not superuser, return only organizations they belong to.
+    Members are only loaded when `users` is among the requested `fields`
+    (or no `fields` are given).
     """
-    if crud.user.is_superuser(current_user):
-        organizations = crud.organization.get_multi(db, skip=skip, limit=limit)
-    else:
-        organizations = current_user.organizations
-    return organizations
+    selected = parse_fields(fields, ORGANIZATION_FIELDS)
+    organizations = crud.organization.get_multi_rows(
+        db,
+        member_id=None if crud.user.is_superuser(current_user) else current_user.id,
+        skip=skip,
+        limit=limit,
+        fields=selected
+    )
+    return rows_response(organizations, partial=selected is not None)
 
 @router.post("/", response_model=Organization)
 def create_organization(
@@ -77,6 +93,8 @@ def create_organization(
 @router.get("/{organization_id}", response_model=Organization)
 def read_organization(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     organization_id: int,
     current_user: User = Depends(deps.get_current_active_user),
@@ -89,7 +107,12 @@ def read_organization(
         raise HTTPException(status_code=404, detail="Organization not found")
     if not crud.user.is_superuser(current_user) and organization not in current_user.organizations:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return organization
+    version = check_not_modified(db, request, response, organization_id)
+    cache_key = response_cache.key(request, version, permission_fingerprint(request, current_user))
+    cached = response_cache.lookup(cache_key, response)
+    if cached is not None:
+        return cached
+    return response_cache.store(cache_key, organization, response, schema=Organization)
 
 @router.put("/{organization_id}", response_model=Organization)
 def update_organization(
@@ -113,7 +136,7 @@ def update_organization(
     return organization
 
 @router.post("/{organization_id}/invitations", response_model=InvitationResponse)
-async def create_invitation(
+def create_invitation(
     *,
     db: Session = Depends(deps.get_db),
     organization_id: int,
@@ -136,7 +159,6 @@ async def create_invitation(
     if not role or role.organization_id != organization_id:
         raise HTTPException(status_code=404, detail="Role not found in this organization")
     
-    # Create invitation
     invitation = crud.invitation.create(
         db=db,
         obj_in=invitation_in,
@@ -144,30 +166,32 @@ async def create_invitation(
         invited_by_id=current_user.id
     )
     
-    # Send invitation email
-    try:
-        await send_invitation_email(
-            email=invitation_in.email,
-            inviter_name=current_user.full_name,
-            organization_name=organization.name,
-            token=invitation.token
-        )
-    except Exception as e:
-        # Log the error but don't fail the request
-        print(f"Failed to send invitation email: {e}")
+    # Queue the email with its accept link; it is committed together with the invitation
+    enqueue_email(
+        db,
+        "invitation",
+        invitation.email,
+        inviter_name=current_user.full_name,
+        org_id=organization_id,
+        token=invitation.token
+    )
     
     return invitation
 
 @router.get("/{organization_id}/invitations", response_model=List[InvitationResponse])
 def read_invitations(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     organization_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get all invitations for an organization.
     """
+    selected = parse_fields(fields, INVITATION_FIELDS)
     organization = crud.organization.get(db=db, id=organization_id)
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -175,7 +199,12 @@ def read_invitations(
     if not crud.organization.is_admin(db, org_id=organization_id, user_id=current_user.id):
         raise HTTPException(status_code=403, detail="Only organization admins can view invites")
     
-    return crud.invitation.get_by_organization(db=db, organization_id=organization_id)
+    check_not_modified(db, request, response, organization_id)
+    return rows_response(
+        crud.invitation.get_rows_by_organization(db=db, organization_id=organization_id, fields=selected),
+        response,
+        partial=selected is not None
+    )
 
 @router.delete("/{organization_id}/invitations/{invitation_id}", response_model=Any)
 def cancel_invitation(
@@ -203,7 +232,7 @@ def cancel_invitation(
     return {"status": "success", "message": "Invitation cancelled"}
 
 @router.post("/{organization_id}/invitations/{invitation_id}/resend", response_model=Any)
-async def resend_invitation(
+def resend_invitation(
     *,
     db: Session = Depends(deps.get_db),
     organization_id: int,
@@ -224,20 +253,16 @@ async def resend_invitation(
     if not invitation or invitation.organization_id != organization_id:
         raise HTTPException(status_code=404, detail="Invitation not found")
     
-    # Refresh invitation token and expiry
+    # Refresh the token and expiry, and queue the new link in the same commit
     invitation = crud.invitation.refresh(db=db, db_obj=invitation)
-    
-    # Resend invitation email
-    try:
-        await send_invitation_email(
-            email=invitation.email,
-            inviter_name=current_user.full_name,
-            organization_name=organization.name,
-            token=invitation.token
-        )
-    except Exception as e:
-        # Log the error but don't fail the request
-        print(f"Failed to send invitation email: {e}")
+    enqueue_email(
+        db,
+        "invitation",
+        invitation.email,
+        inviter_name=current_user.full_name,
+        org_id=organization_id,
+        token=invitation.token
+    )
     
     return {"status": "success", "message": "Invitation resent"}
 
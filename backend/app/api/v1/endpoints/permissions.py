@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -7,8 +7,12 @@ from app.models.user import User
 from app.models.permission import Permission
 from app.schemas.permission import PermissionCreate, PermissionUpdate, PermissionResponse
 from app.crud import permission
+from app.core.response_cache import permission_fingerprint, response_cache
+from app.utils.content_version import check_not_modified, touch_organization
+from app.utils.permission_index import rebuild_organization
+from app.db.uow import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 # Default permissions that will be created for each organization
 DEFAULT_PERMISSIONS = [
@@ -34,15 +38,21 @@ def create_new_permission(
             status_code=403,
             detail="Not enough permissions to create permissions"
         )
-    return permission.create(db=db, obj_in=permission_in, organization_id=current_user.organization_id)
+    db_permission = permission.create(db=db, obj_in=permission_in, organization_id=current_user.organization_id)
+    rebuild_organization(db, current_user.organization_id)
+    return db_permission
 
 @router.get("/{permission_id}", response_model=PermissionResponse)
 def read_permission(
+    request: Request,
+    response: Response,
     permission_id: int = Path(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific permission by ID."""
+    if current_user.organization_id:
+        check_not_modified(db, request, response, current_user.organization_id)
     db_permission = permission.get(db=db, id=permission_id)
     if not db_permission:
         raise HTTPException(status_code=404, detail="Permission not found")
@@ -52,6 +62,8 @@ def read_permission(
 
 @router.get("/", response_model=List[PermissionResponse])
 def read_permissions(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -60,35 +72,47 @@ def read_permissions(
     """Get all permissions for the specified organization."""
     if not current_user.organization_id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Permissions are scoped to the caller's organization, so it keys the ETag
+    version = check_not_modified(db, request, response, current_user.organization_id)
+    cache_key = response_cache.key(request, version, permission_fingerprint(request, current_user))
+    cached = response_cache.lookup(cache_key, response)
+    if cached is not None:
+        return cached
 
     # Check if organization has any permissions
-    existing_permissions = permission.get_multi_by_organization(
-        db=db,
-        organization_id=current_user.organization_id,
+    existing_permissions = permission.get_rows(
+        db,
+        PermissionResponse,
+        Permission.organization_id == current_user.organization_id,
         skip=skip,
         limit=limit
     )
 
-    # If no permissions exist, create default permissions
+    # If no permissions exist, seed the defaults in one statement; concurrent
+    # first requests are harmless since existing names are skipped
     if not existing_permissions:
-        for perm in DEFAULT_PERMISSIONS:
-            permission.create(
-                db=db,
-                obj_in=PermissionCreate(
-                    name=perm["name"],
-                    description=perm["description"],
-                    category=perm["category"]
-                ),
-                organization_id=current_user.organization_id
-            )
-        existing_permissions = permission.get_multi_by_organization(
-            db=db,
-            organization_id=current_user.organization_id,
+        permission.upsert_many(
+            db,
+            objs_in=[
+                {**perm, "organization_id": current_user.organization_id}
+                for perm in DEFAULT_PERMISSIONS
+            ],
+            index_elements=["name", "organization_id"],
+            update_fields=[]
+        )
+        touch_organization(db, current_user.organization_id)
+        rebuild_organization(db, current_user.organization_id)
+        # The request's commit moves content_version past the key's version
+        cache_key = None
+        existing_permissions = permission.get_rows(
+            db,
+            PermissionResponse,
+            Permission.organization_id == current_user.organization_id,
             skip=skip,
             limit=limit
         )
 
-    return existing_permissions
+    return response_cache.store(cache_key, existing_permissions, response, schema=List[PermissionResponse])
 
 @router.put("/{permission_id}", response_model=PermissionResponse)
 def update_existing_permission(
@@ -104,7 +128,10 @@ def update_existing_permission(
         raise HTTPException(status_code=404, detail="Permission not found")
     if db_permission.organization_id != current_user.organization_id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return permission.update(db=db, db_obj=db_permission, obj_in=permission_update)
+    db_permission = permission.update(db=db, db_obj=db_permission, obj_in=permission_update)
+    # Decisions are cached by permission name, so a rename must invalidate them
+    rebuild_organization(db, current_user.organization_id)
+    return db_permission
 
 @router.delete("/{permission_id}")
 def delete_existing_permission(
@@ -119,4 +146,5 @@ def delete_existing_permission(
     if db_permission.organization_id != current_user.organization_id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     permission.remove(db=db, id=permission_id)
+    rebuild_organization(db, current_user.organization_id)
     return {"message": "Permission deleted successfully"}
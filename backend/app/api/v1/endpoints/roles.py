@@ -1,38 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_db, require_permission
 from app.models.user import User
 from app.models.role import Role
 from app.models.permission import Permission
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse
 from app.crud.role import role
-from app.utils.permissions import check_permission
+from app.core.response_cache import permission_fingerprint, response_cache
+from app.utils.content_version import check_not_modified
+from app.utils.fieldsets import FIELDS_QUERY, parse_fields
+from app.utils.permission_index import rebuild_organization
+from app.db.uow import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+# Fields selectable with `fields=` on read_roles
+ROLE_FIELDS = frozenset(RoleResponse.model_fields)
 
 @router.post("/", response_model=RoleResponse)
 def create_new_role(
     role_in: RoleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_permission("manage_roles")),
     organization_id: int = Path(...)
 ):
     """Create a new role with specified permissions."""
-    check_permission(current_user, organization_id, "manage_roles")
     return role.create(db=db, obj_in=role_in, organization_id=organization_id)
 
 @router.get("/{role_id}", response_model=RoleResponse)
 def read_role(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_permission("view_roles")),
     role_id: int = Path(...),
     organization_id: int = Path(...)
 ):
     """Get a specific role by ID."""
-    check_permission(current_user, organization_id, "view_roles")
-    
+    check_not_modified(db, request, response, organization_id)
     db_role = role.get(db=db, id=role_id)
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
@@ -42,53 +49,62 @@ def read_role(
 
 @router.get("/", response_model=List[RoleResponse])
 def read_roles(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_permission("view_roles")),
     organization_id: int = Path(...),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[str] = FIELDS_QUERY
 ):
     """Get all roles for the specified organization."""
-    check_permission(current_user, organization_id, "view_roles")
-    
-    # Get roles for the specified organization
-    roles = role.get_multi_by_organization(
+    selected = parse_fields(fields, ROLE_FIELDS)
+    version = check_not_modified(db, request, response, organization_id)
+    cache_key = response_cache.key(request, version, permission_fingerprint(request, current_user))
+    cached = response_cache.lookup(cache_key, response)
+    if cached is not None:
+        return cached
+    # Get roles for the specified organization as projected rows
+    roles = role.get_rows_by_organization(
         db=db,
         organization_id=organization_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        fields=selected
+    )
+    return response_cache.store(
+        cache_key, roles, response,
+        schema=List[RoleResponse] if selected is None else Any
     )
-    return roles
 
 @router.put("/{role_id}", response_model=RoleResponse)
 def update_existing_role(
     role_update: RoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_permission("manage_roles")),
     role_id: int = Path(...),
     organization_id: int = Path(...)
 ):
     """Update a role's details."""
-    check_permission(current_user, organization_id, "manage_roles")
-    
     db_role = role.get(db=db, id=role_id)
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
     if db_role.organization_id != organization_id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return role.update(db=db, db_obj=db_role, obj_in=role_update)
+    db_role = role.update(db=db, db_obj=db_role, obj_in=role_update)
+    rebuild_organization(db, organization_id)
+    return db_role
 
 @router.delete("/{role_id}")
 def delete_existing_role(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_permission("manage_roles")),
     role_id: int = Path(...),
     organization_id: int = Path(...)
 ):
     """Delete a role."""
-    check_permission(current_user, organization_id, "manage_roles")
-    
     db_role = role.get(db=db, id=role_id)
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
@@ -96,4 +112,5 @@ def delete_existing_role(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     role.remove(db=db, id=role_id)
+    rebuild_organization(db, organization_id)
     return {"message": "Role deleted successfully"}
@@ -9,8 +9,9 @@ from app.models.user import User as DBUser
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.api import deps
 from app.core.config import settings
+from app.db.uow import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=List[User])
 def read_users(
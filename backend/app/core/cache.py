@@ -0,0 +1,164 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a time-to-live.
+    **Parameters**
+    * `maxsize`: Maximum number of entries kept before evicting the least recently used
+    * `ttl`: Default lifetime of an entry in seconds
+    * `on_evict`: Called with `(key, value)` when an entry expires or is evicted
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evicted(self, entries: List[Tuple[Hashable, Any]]) -> None:
+        # Outside the lock, so callbacks may take locks of their own
+        if self.on_evict is not None:
+            for key, value in entries:
+                self.on_evict(key, value)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+            self.misses += 1
+        self._evicted([(key, value)])
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        evicted = []
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + lifetime)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, (old_value, _) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value))
+                self.evictions += 1
+        self._evicted(evicted)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class PrincipalCache:
+    """
+    Caches the authenticated user behind a bearer token so get_current_user
+    can skip both the JWT decode and the primary-key lookup on a hit.
+    Entries are keyed by token hash and indexed by user id for eviction;
+    the index is pruned as entries expire or fall out of the LRU, so it
+    stays bounded by `maxsize`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=self._unindex)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._columns = [attr.key for attr in inspect(User).column_attrs]
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def load(self, db: Session, token: str) -> Optional[User]:
+        """Return the cached user attached to `db`, without querying."""
+        snapshot = self._cache.get(self._token_key(token))
+        if snapshot is None:
+            return None
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def store(self, token: str, user: User, expires_at: Optional[float] = None) -> None:
+        key = self._token_key(token)
+        ttl = None
+        if expires_at is not None:
+            ttl = expires_at - time.time()
+            if ttl <= 0:
+                return
+        snapshot = {column: getattr(user, column) for column in self._columns}
+        # Indexed first, so an immediate eviction of this entry unindexes it
+        with self._lock:
+            self._tokens_by_user.setdefault(user.id, set()).add(key)
+        self._cache.set(key, snapshot, ttl=ttl)
+
+    def _unindex(self, key: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            keys = self._tokens_by_user.get(snapshot["id"])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tokens_by_user[snapshot["id"]]
+
+    def evict_user(self, user_id: int) -> None:
+        with self._lock:
+            keys = self._tokens_by_user.pop(user_id, set())
+        for key in keys:
+            self._cache.delete(key)
+
+    def evict_user_on_commit(self, db: Session, user_id: int) -> None:
+        """Evict now and again when `db` commits, so no request re-caches the old row meanwhile"""
+        self.evict_user(user_id)
+        event.listen(db, "after_commit", lambda session: self.evict_user(user_id), once=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens_by_user.clear()
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
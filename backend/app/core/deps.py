@@ -1,31 +1,34 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import Depends, HTTPException, Path, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import principal_cache
 from app.core.config import settings
 from app.core.security import verify_password
-from app.db.session import SessionLocal
+from app.db.session import get_async_db, get_db
+from app.models.permission import Permission
+from app.models.permission_mask import MembershipPermissionMask
 from app.models.user import User
+from app.models.user_organization import UserOrganization
 from app.schemas.token import TokenPayload
+from app.utils.permission_index import cached_permission, mask_allows
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(reusable_oauth2)
 ) -> User:
+    user = principal_cache.load(db, token)
+    if user is not None:
+        return user
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -39,6 +42,7 @@ def get_current_user(
     user = db.query(User).filter(User.id == token_data.sub).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.store(token, user, expires_at=payload.get("exp"))
     return user
 
 def get_current_active_user(
@@ -56,3 +60,108 @@ def get_current_active_superuser(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+def _decode_token(token: str) -> TokenPayload:
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        return TokenPayload(**payload)
+    except (jwt.JWTError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+def _permission_statement(user_id: Any, organization_id: int, permission_name: str):
+    """The caller, their membership, compiled mask and the permission's bit in one row"""
+    return (
+        select(
+            User,
+            UserOrganization,
+            MembershipPermissionMask.mask,
+            Permission.id,
+            Permission.bit_position,
+        )
+        .outerjoin(UserOrganization, and_(
+            UserOrganization.user_id == User.id,
+            UserOrganization.organization_id == organization_id
+        ))
+        .outerjoin(MembershipPermissionMask, and_(
+            MembershipPermissionMask.user_id == User.id,
+            MembershipPermissionMask.organization_id == organization_id
+        ))
+        .outerjoin(Permission, and_(
+            Permission.organization_id == organization_id,
+            Permission.name == permission_name
+        ))
+        .where(User.id == user_id)
+        .limit(1)
+    )
+
+def _check_row(row, permission_name: str) -> Optional[bool]:
+    """Decide from the joined row; None means the mask must be compiled first"""
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+    user, membership, mask, permission_id, bit_position = row
+    if membership is None:
+        raise HTTPException(
+            status_code=403,
+            detail="User does not belong to this organization"
+        )
+    if mask is None or (permission_id is not None and bit_position is None):
+        return None
+    return permission_id is not None and mask_allows(mask, bit_position)
+
+def _authorize(request: Request, row, allowed: bool, permission_name: str) -> User:
+    user, membership = row[0], row[1]
+    if not allowed and not user.is_superuser:
+        raise HTTPException(
+            status_code=403,
+            detail=f"User does not have the required permission: {permission_name}"
+        )
+    request.state.membership = membership
+    return user
+
+def require_permission(permission_name: str) -> Callable[..., User]:
+    """
+    Dependency factory that authenticates the caller and checks
+    `permission_name` in the path `organization_id` with one joined query.
+    The caller's UserOrganization is stored on `request.state.membership`.
+    """
+    def dependency(
+        request: Request,
+        organization_id: int = Path(...),
+        db: Session = Depends(get_db),
+        token: str = Depends(reusable_oauth2)
+    ) -> User:
+        token_data = _decode_token(token)
+        row = db.execute(
+            _permission_statement(token_data.sub, organization_id, permission_name)
+        ).first()
+        allowed = _check_row(row, permission_name)
+        if allowed is None:
+            # Membership not compiled yet; compile it through the slow path
+            allowed = bool(cached_permission(db, row[0].id, organization_id, permission_name))
+        return _authorize(request, row, allowed, permission_name)
+    return dependency
+
+def require_permission_async(permission_name: str) -> Callable[..., Awaitable[User]]:
+    """require_permission for `async def` endpoints using an AsyncSession"""
+    async def dependency(
+        request: Request,
+        organization_id: int = Path(...),
+        db: AsyncSession = Depends(get_async_db),
+        token: str = Depends(reusable_oauth2)
+    ) -> User:
+        token_data = _decode_token(token)
+        row = (await db.execute(
+            _permission_statement(token_data.sub, organization_id, permission_name)
+        )).first()
+        allowed = _check_row(row, permission_name)
+        if allowed is None:
+            allowed = bool(await db.run_sync(
+                cached_permission, row[0].id, organization_id, permission_name
+            ))
+        return _authorize(request, row, allowed, permission_name)
+    return dependency
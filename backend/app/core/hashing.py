@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds a hash spent in a worker, and waiting for one
+password_hash_seconds = Histogram(HASH_BUCKETS)
+password_hash_wait_seconds = Histogram(HASH_BUCKETS)
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Runs in the worker process: the result and how long computing it took"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work in a bounded process pool so the event loop never blocks.
+    **Parameters**
+    * `workers`: Number of worker processes
+    * `max_queue`: Hashes allowed to wait for a free worker before rejecting with 503
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+
+    def _release(self, elapsed: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hashing = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+            password_hash_seconds.observe((), hashing)
+            password_hash_wait_seconds.observe((), max(time.perf_counter() - started - hashing, 0.0))
+            return result
+        finally:
+            self._release(time.perf_counter() - started)
+
+    async def run_many(self, fn: Callable[..., Any], args: Iterable[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Run a batch through `run`, with at most `workers` of its hashes in
+        flight at once. Each hash takes its own queue slot and latency
+        sample, so other callers queue behind a few batch hashes rather than
+        the whole batch, and a full queue still rejects with 503.
+        """
+        in_flight = asyncio.Semaphore(self.workers)
+
+        async def one(arg: Tuple[Any, ...]) -> Any:
+            async with in_flight:
+                return await self.run(fn, *arg)
+
+        return list(await asyncio.gather(*(one(arg) for arg in args)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "running": min(self._in_flight, self.workers),
+                "queue_depth": max(self._in_flight - self.workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_latency_seconds": (
+                    self._total_seconds / self._completed if self._completed else 0.0
+                ),
+                "max_latency_seconds": self._max_seconds,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
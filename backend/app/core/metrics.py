@@ -0,0 +1,140 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Sequence, Tuple, Union
+
+# Default upper bounds, in seconds, for latency histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative histogram keyed by a label tuple, e.g. (method, route).
+    **Parameters**
+    * `buckets`: Sorted upper bounds; an implicit +Inf bucket is added
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series: Dict[Hashable, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Hashable, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One slot per bucket plus +Inf, then sum and count
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict[Hashable, Tuple[List[int], float, int]]:
+        """Per label tuple: cumulative bucket counts, sum and count"""
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        snapshot = {}
+        for labels, values in series.items():
+            cumulative, running = [], 0
+            for count in values[:-2]:
+                running += count
+                cumulative.append(running)
+            snapshot[labels] = (cumulative, values[-2], values[-1])
+        return snapshot
+
+
+class Counter:
+    """Monotonic counter keyed by a label tuple"""
+
+    def __init__(self):
+        self._series: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Hashable, amount: float = 1) -> None:
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def snapshot(self) -> Dict[Hashable, float]:
+        with self._lock:
+            return dict(self._series)
+
+
+# Per (method, route template, status)
+http_requests = Counter()
+http_request_seconds = Histogram()
+
+# Per engine ("sync" or "async"): seconds spent waiting for a pooled connection
+pool_wait_seconds = Histogram((0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count and latency per route template
+    and status code. Unmatched paths share one label to bound cardinality.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"), str(status_code))
+            http_requests.inc(labels)
+            http_request_seconds.observe(labels, time.perf_counter() - started)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_counter(
+    name: str, help: str, label_names: Sequence[str], counter: Union[Counter, Dict[Tuple[Any, ...], float]]
+) -> List[str]:
+    """A Counter, or samples of a total kept elsewhere that only ever grows"""
+    samples = counter.snapshot() if isinstance(counter, Counter) else counter
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+    return lines
+
+
+def render_histogram(name: str, help: str, label_names: Sequence[str], histogram: Histogram) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+    bounds = [repr(float(bound)) for bound in histogram.buckets] + ["+Inf"]
+    for labels, (cumulative, total, count) in sorted(histogram.snapshot().items()):
+        for bound, value in zip(bounds, cumulative):
+            le = 'le="%s"' % bound
+            lines.append(f"{name}_bucket{_labels(label_names, labels, le)} {value}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {total}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {count}")
+    return lines
+
+
+def render_gauge(name: str, help: str, samples: Dict[Tuple[Any, ...], float], label_names: Sequence[str] = ()) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+    return lines
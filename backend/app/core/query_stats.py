@@ -0,0 +1,109 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional, Set
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Bind-parameter lists such as IN (%(id_1)s, %(id_2)s) collapse to one shape
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Per (method, route template): statements per request and DB seconds per request
+route_query_counts = Histogram(QUERY_COUNT_BUCKETS)
+route_query_seconds = Histogram()
+
+
+class NPlusOneDetected(RuntimeError):
+    """Raised in strict mode when one statement shape repeats too often in a request"""
+
+
+class QueryStats:
+    """SQL statements executed while handling one request"""
+
+    __slots__ = ("count", "seconds", "shapes", "flagged")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.flagged: Set[str] = set()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        threshold = settings.QUERY_NPLUSONE_THRESHOLD
+        if not threshold:
+            return
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.shapes[shape] > threshold and shape not in self.flagged:
+            self.flagged.add(shape)
+            logger.warning(
+                "Possible N+1: statement ran more than %d times in one request: %s",
+                threshold, shape[:500]
+            )
+            if settings.QUERY_NPLUSONE_STRICT:
+                raise NPlusOneDetected(
+                    f"Statement ran more than {threshold} times in one request: {shape[:500]}"
+                )
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats differing only in bind counts compare equal"""
+    return _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+async def query_stats_middleware(request: Request, call_next: Any):
+    """Count statements and DB time per request; report them as headers and per route"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    route = request.scope.get("route")
+    labels = (request.method, getattr(route, "path", "unmatched"))
+    route_query_counts.observe(labels, stats.count)
+    route_query_seconds.observe(labels, stats.seconds)
+    if settings.QUERY_STATS_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+    logger.debug(
+        "%s %s: %d statements, %.1f ms in the database",
+        labels[0], labels[1], stats.count, stats.seconds * 1000
+    )
+    return response
@@ -0,0 +1,138 @@
+import hashlib
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResponseCache(ABC):
+    """
+    Interface for the optional shared tier (e.g. Redis or memcached) behind
+    the in-process LRU, selected with RESPONSE_CACHE_BACKEND. Keys are
+    short ASCII strings; failures should raise, they are logged and treated
+    as misses.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """The stored value, or None on a miss"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store `value` for `ttl` seconds"""
+
+
+def load_shared_backend(path: Optional[str]) -> Optional[SharedResponseCache]:
+    """Build the shared tier from a `package.module:factory` path"""
+    if not path:
+        return None
+    module_name, _, factory = path.partition(":")
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def permission_fingerprint(request: Request, user: User) -> str:
+    """
+    What decides which content an authorized caller sees: superuser status,
+    the role behind the membership require_permission resolved, and the
+    caller's home organization (which scopes the permissions endpoints).
+    """
+    membership = getattr(request.state, "membership", None)
+    role_id = membership.role_id if membership is not None else None
+    return f"{int(bool(user.is_superuser))}:{role_id}:{user.organization_id}"
+
+
+class ResponseCache:
+    """
+    Two-tier cache of serialized GET responses for tenant-scoped content.
+    Keys combine the route, path and query parameters, the caller's
+    permission fingerprint and the organization's content_version, so a
+    write to the organization invalidates every entry by changing the key;
+    stale entries age out of the LRU.
+    **Parameters**
+    * `maxsize`: Responses kept in process
+    * `ttl`: Lifetime of an entry in seconds, in both tiers
+    * `shared`: Optional SharedResponseCache consulted on a local miss
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shared: Optional[SharedResponseCache] = None):
+        self.ttl = ttl
+        self.shared = shared
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def key(self, request: Request, version: Optional[int], fingerprint: str) -> Optional[str]:
+        """Cache key for this request, or None when the content has no version"""
+        if version is None:
+            return None
+        route = request.scope.get("route")
+        parts = (
+            getattr(route, "path", request.url.path),
+            sorted(request.path_params.items()),
+            sorted(request.query_params.multi_items()),
+            fingerprint,
+            version,
+        )
+        return "resp:" + hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def _render(self, body: bytes, response: Response) -> Response:
+        rendered = Response(content=body, media_type="application/json")
+        rendered.headers.raw.extend(response.headers.raw)
+        return rendered
+
+    def lookup(self, key: Optional[str], response: Response) -> Optional[Response]:
+        """The cached response for `key`, carrying headers set on `response`"""
+        if key is None:
+            return None
+        body = self._local.get(key)
+        if body is None and self.shared is not None:
+            try:
+                body = self.shared.get(key)
+            except Exception:
+                logger.warning("Shared response cache read failed", exc_info=True)
+            if body is not None:
+                self._local.set(key, body)
+        return self._render(body, response) if body is not None else None
+
+    def store(self, key: Optional[str], content: Any, response: Response, schema: Any = Any) -> Response:
+        """
+        Serialize `content` once, validated against `schema` (the route's
+        response_model; leave it out for sparse fieldsets), cache it under
+        `key` and return it as the response.
+        """
+        adapter = _adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        if key is not None:
+            self._local.set(key, body)
+            if self.shared is not None:
+                try:
+                    self.shared.set(key, body, self.ttl)
+                except Exception:
+                    logger.warning("Shared response cache write failed", exc_info=True)
+        return self._render(body, response)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._local.stats()
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    shared=load_shared_backend(settings.RESPONSE_CACHE_BACKEND),
+)
@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+# Default response class for the app; ORJSONResponse needs orjson installed
+DefaultResponse = ORJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+
+
+@lru_cache(maxsize=1024)
+def projection(
+    model: Type[Any], schema: Type[BaseModel], fields: Optional[FrozenSet[str]] = None
+) -> Tuple[ColumnElement, ...]:
+    """
+    Columns of `model` that `schema` serializes, limited to `fields` when
+    given, computed once per combination. Nested schema fields
+    (relationships) are left to the caller.
+    """
+    columns = inspect(model).columns
+    return tuple(
+        columns[name] for name in schema.model_fields
+        if name in columns and (fields is None or name in fields)
+    )
+
+
+def rows_response(
+    rows: List[Dict[str, Any]],
+    response: Optional[Response] = None,
+    partial: bool = False
+) -> Any:
+    """
+    Return projected rows from a list endpoint. With FAST_JSON_RESPONSES
+    they are encoded by orjson directly, skipping response_model validation;
+    otherwise FastAPI validates them against the route's response_model.
+    Rows must already have the response_model's shape unless `partial`
+    (a sparse fieldset), which always bypasses response_model. Pass the
+    endpoint's injected `response` so headers set on it are kept either way.
+    """
+    if not (settings.FAST_JSON_RESPONSES or partial):
+        return rows
+    direct = DefaultResponse(rows if settings.FAST_JSON_RESPONSES else jsonable_encoder(rows))
+    if response is not None:
+        direct.headers.raw.extend(response.headers.raw)
+    return direct
@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, List, Union
 from jose import jwt
 import bcrypt
 from app.core.config import settings
+from app.core.hashing import password_hasher
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -28,3 +29,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    return await password_hasher.run_many(get_password_hash, [(password,) for password in passwords])
@@ -1,7 +1,11 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Sequence, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.responses import projection
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -12,6 +16,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
+        Every method has an `*_async` variant taking an AsyncSession.
+        Methods flush but never commit; the request's unit of work (see
+        app.db.uow) commits once. The `*_many` methods issue one statement
+        with RETURNING.
         **Parameters**
         * `model`: A SQLAlchemy model class
         * `schema`: A Pydantic model (schema) class
@@ -26,21 +34,29 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_rows(
+        self,
+        db: Session,
+        schema: Type[BaseModel],
+        *criteria: Any,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Rows as plain dicts holding only `schema`'s columns (or `fields`), without ORM objects"""
+        result = db.execute(self._rows_statement(schema, criteria, skip, limit, fields))
+        return [dict(row) for row in result.mappings()]
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)  # type: ignore
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
-    def update(
-        self,
-        db: Session,
-        *,
-        db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
-    ) -> ModelType:
+    def _apply_update(
+        self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> None:
         obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -49,13 +65,224 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        self._apply_update(db_obj, obj_in)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
+        db.flush()
         return obj
+
+    def get_many(self, db: Session, ids: Sequence[Any]) -> List[ModelType]:
+        """Rows for `ids` in one query, in the order given; missing ids are skipped"""
+        return self._in_order(db.scalars(self._get_many_statement(ids)), ids)
+
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        if not objs_in:
+            return []
+        return list(db.scalars(
+            insert(self.model).returning(self.model), self._rows(objs_in)
+        ))
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        ids: Sequence[Any],
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> List[ModelType]:
+        """Apply the same changes to every row in `ids`; returns the updated rows"""
+        if not ids:
+            return []
+        return list(db.scalars(
+            self._update_many_statement(ids, obj_in),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ))
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None
+    ) -> List[ModelType]:
+        """
+        Insert rows, resolving conflicts on the unique `index_elements`.
+        Conflicting rows get `update_fields` (default: every supplied column)
+        overwritten; pass an empty list to leave them untouched, in which case
+        only the inserted rows are returned.
+        """
+        if not objs_in:
+            return []
+        statement = self._upsert_statement(
+            db.get_bind().dialect.name, objs_in, index_elements, update_fields
+        )
+        return list(db.scalars(statement, execution_options={"populate_existing": True}))
+
+    def _rows(self, objs_in: Sequence[Union[BaseModel, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [obj if isinstance(obj, dict) else jsonable_encoder(obj) for obj in objs_in]
+
+    def _rows_statement(
+        self,
+        schema: Type[BaseModel],
+        criteria: Sequence[Any],
+        skip: int,
+        limit: int,
+        fields: Optional[FrozenSet[str]] = None
+    ):
+        return (
+            select(*projection(self.model, schema, fields))
+            .where(*criteria)
+            .order_by(self.model.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+    def _get_many_statement(self, ids: Sequence[Any]):
+        return select(self.model).where(self.model.id.in_(set(ids)))
+
+    @staticmethod
+    def _in_order(rows: Any, ids: Sequence[Any]) -> List[ModelType]:
+        by_id = {row.id: row for row in rows}
+        return [by_id[id] for id in dict.fromkeys(ids) if id in by_id]
+
+    def _update_many_statement(
+        self, ids: Sequence[Any], obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ):
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        return (
+            update(self.model)
+            .where(self.model.id.in_(set(ids)))
+            .values(**update_data)
+            .returning(self.model)
+        )
+
+    def _upsert_statement(
+        self,
+        dialect: str,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]]
+    ):
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect)
+        if dialect_insert is None:
+            raise NotImplementedError(f"upsert_many is not supported on {dialect}")
+        rows = self._rows(objs_in)
+        statement = dialect_insert(self.model).values(rows)
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in index_elements]
+            if "updated_at" in self.model.__table__.c and "updated_at" not in update_fields:
+                update_fields.append("updated_at")
+        if update_fields:
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={field: statement.excluded[field] for field in update_fields}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+        return statement.returning(self.model)
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.scalar(select(self.model).where(self.model.id == id))
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def get_rows_async(
+        self,
+        db: AsyncSession,
+        schema: Type[BaseModel],
+        *criteria: Any,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> List[Dict[str, Any]]:
+        result = await db.execute(self._rows_statement(schema, criteria, skip, limit, fields))
+        return [dict(row) for row in result.mappings()]
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)  # type: ignore
+        db.add(db_obj)
+        await db.flush()
+        return db_obj
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        self._apply_update(db_obj, obj_in)
+        db.add(db_obj)
+        await db.flush()
+        return db_obj
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        if obj is not None:
+            await db.delete(obj)
+            await db.flush()
+        return obj
+
+    async def get_many_async(self, db: AsyncSession, ids: Sequence[Any]) -> List[ModelType]:
+        return self._in_order(await db.scalars(self._get_many_statement(ids)), ids)
+
+    async def create_many_async(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        if not objs_in:
+            return []
+        return list(await db.scalars(
+            insert(self.model).returning(self.model), self._rows(objs_in)
+        ))
+
+    async def update_many_async(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Sequence[Any],
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> List[ModelType]:
+        if not ids:
+            return []
+        return list(await db.scalars(
+            self._update_many_statement(ids, obj_in),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ))
+
+    async def upsert_many_async(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None
+    ) -> List[ModelType]:
+        if not objs_in:
+            return []
+        statement = self._upsert_statement(
+            db.get_bind().dialect.name, objs_in, index_elements, update_fields
+        )
+        return list(await db.scalars(statement, execution_options={"populate_existing": True}))
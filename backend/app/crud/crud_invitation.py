@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 from datetime import datetime, timedelta
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.core.responses import projection
 from app.crud.base import CRUDBase
 from app.models.invitation import Invitation
-from app.schemas.invitation import InvitationCreate, InvitationUpdate
+from app.models.user import User
+from app.schemas.invitation import InvitationCreate, InvitationUpdate, InvitationResponse
 import secrets
 
 class CRUDInvitation(CRUDBase[Invitation, InvitationCreate, InvitationUpdate]):
@@ -28,8 +31,7 @@ class CRUDInvitation(CRUDBase[Invitation, InvitationCreate, InvitationUpdate]):
             is_accepted=False
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def get_by_organization(
@@ -47,6 +49,42 @@ class CRUDInvitation(CRUDBase[Invitation, InvitationCreate, InvitationUpdate]):
             .all()
         )
     
+    def get_rows_by_organization(
+        self,
+        db: Session,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        InvitationResponse-shaped dicts with the inviter joined in the same
+        query, unless a sparse `fields` set leaves `invited_by` out.
+        """
+        with_inviter = fields is None or "invited_by" in fields
+        query = (
+            select(*projection(Invitation, InvitationResponse, fields))
+            .where(Invitation.organization_id == organization_id)
+            .order_by(Invitation.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        if with_inviter:
+            query = query.add_columns(
+                User.id.label("inviter_id"),
+                User.full_name.label("inviter_name")
+            ).join_from(Invitation, User, User.id == Invitation.invited_by_id)
+        rows = []
+        for row in db.execute(query).mappings():
+            invitation = dict(row)
+            if with_inviter:
+                invitation["invited_by"] = {
+                    "id": invitation.pop("inviter_id"),
+                    "full_name": invitation.pop("inviter_name"),
+                }
+            rows.append(invitation)
+        return rows
+    
     def get_by_token(
         self, 
         db: Session, 
@@ -85,8 +123,7 @@ class CRUDInvitation(CRUDBase[Invitation, InvitationCreate, InvitationUpdate]):
         db_obj.token = secrets.token_urlsafe(32)
         db_obj.expires_at = datetime.utcnow() + timedelta(days=7)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
 invitation = CRUDInvitation(Invitation)
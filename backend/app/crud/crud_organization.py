@@ -21,8 +21,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         user = db.query(User).filter(User.id == user_id).first()
         if org and user:
             org.users.append(user)
-            db.commit()
-            db.refresh(org)
+            db.flush()
             return org
         return None
 
@@ -31,8 +30,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         user = db.query(User).filter(User.id == user_id).first()
         if org and user:
             org.users.remove(user)
-            db.commit()
-            db.refresh(org)
+            db.flush()
             return org
         return None
 
@@ -49,8 +47,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
             status="pending"
         )
         db.add(join_request)
-        db.commit()
-        db.refresh(join_request)
+        db.flush()
         return join_request
 
     def update_join_request(
@@ -65,8 +62,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
                     org_id=join_request.organization_id,
                     user_id=join_request.user_id
                 )
-            db.commit()
-            db.refresh(join_request)
+            db.flush()
             return join_request
         return None
 
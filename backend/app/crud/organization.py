@@ -1,10 +1,18 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, FrozenSet, Optional, Union, List
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.responses import projection
 from app.crud.base import CRUDBase
+from app.models.associations import user_roles
 from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
 from app.models.user_organization import UserOrganization
-from app.schemas.organization import OrganizationCreate, OrganizationUpdate
+from app.schemas.organization import Organization as OrganizationSchema, OrganizationCreate, OrganizationUpdate
+from app.schemas.user import Role as UserRoleSchema, User as UserSchema
+from app.utils.permission_index import rebuild_membership, remove_membership
 
 
 class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUpdate]):
@@ -15,8 +23,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
             industry=obj_in.industry
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -38,17 +45,17 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         *,
         org_id: int,
         user_id: int,
-        role: str
+        role_id: int
     ) -> UserOrganization:
         """Add a user to an organization with a specific role."""
         db_obj = UserOrganization(
             organization_id=org_id,
             user_id=user_id,
-            role=role
+            role_id=role_id
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
+        rebuild_membership(db, user_id, org_id)
         return db_obj
 
     def remove_user(
@@ -66,7 +73,8 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         if not obj:
             return False
         db.delete(obj)
-        db.commit()
+        remove_membership(db, [user_id], org_id)
+        db.flush()
         return True
 
     def is_admin(
@@ -80,7 +88,7 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         obj = db.query(UserOrganization).filter(
             UserOrganization.organization_id == org_id,
             UserOrganization.user_id == user_id,
-            UserOrganization.role == "admin"
+            UserOrganization.role.has(Role.name == "admin")
         ).first()
         return obj is not None
 
@@ -109,5 +117,102 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
             UserOrganization.organization_id == org_id
         ).all()
 
+    def get_multi_rows(
+        self,
+        db: Session,
+        *,
+        member_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Organization-shaped dicts, optionally only those `member_id` belongs
+        to. Members (and their roles) are fetched with one query each, and
+        only when `fields` asks for `users`.
+        """
+        criteria = []
+        if member_id is not None:
+            criteria.append(exists().where(
+                UserOrganization.organization_id == Organization.id,
+                UserOrganization.user_id == member_id
+            ))
+        organizations = self.get_rows(
+            db, OrganizationSchema, *criteria, skip=skip, limit=limit, fields=fields
+        )
+        if not organizations or (fields is not None and "users" not in fields):
+            return organizations
+        
+        by_id = {}
+        for row in organizations:
+            row["users"] = []
+            by_id[row["id"]] = row
+        members = [
+            dict(row) for row in db.execute(
+                select(
+                    UserOrganization.organization_id.label("membership_organization_id"),
+                    *projection(User, UserSchema)
+                )
+                .join(User, User.id == UserOrganization.user_id)
+                .where(UserOrganization.organization_id.in_(list(by_id)))
+                .order_by(UserOrganization.organization_id, User.id)
+            ).mappings()
+        ]
+        roles_by_user = {}
+        if members:
+            for row in db.execute(
+                select(user_roles.c.user_id, *projection(Role, UserRoleSchema))
+                .join(Role, Role.id == user_roles.c.role_id)
+                .where(user_roles.c.user_id.in_({member["id"] for member in members}))
+                .order_by(user_roles.c.user_id, Role.id)
+            ).mappings():
+                role = dict(row)
+                roles_by_user.setdefault(role.pop("user_id"), []).append(role)
+        for member in members:
+            member["roles"] = roles_by_user.get(member["id"], [])
+            by_id[member.pop("membership_organization_id")]["users"].append(member)
+        return organizations
+
+    async def create_async(self, db: AsyncSession, *, obj_in: OrganizationCreate) -> Organization:
+        db_obj = Organization(
+            name=obj_in.name,
+            description=obj_in.description,
+            industry=obj_in.industry
+        )
+        db.add(db_obj)
+        await db.flush()
+        return db_obj
+
+    async def remove_user_async(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: int,
+        user_id: int
+    ) -> bool:
+        """Remove a user from an organization."""
+        obj = await db.scalar(select(UserOrganization).where(
+            UserOrganization.organization_id == org_id,
+            UserOrganization.user_id == user_id
+        ))
+        if not obj:
+            return False
+        await db.delete(obj)
+        await db.run_sync(remove_membership, [user_id], org_id)
+        await db.flush()
+        return True
+
+    async def get_organization_users_async(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: int
+    ) -> List[UserOrganization]:
+        """Get all users in an organization with their roles."""
+        result = await db.scalars(select(UserOrganization).where(
+            UserOrganization.organization_id == org_id
+        ))
+        return list(result)
+
 
 organization = CRUDOrganization(Organization)
@@ -1,4 +1,6 @@
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -14,8 +16,19 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
             organization_id=organization_id
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
+        return db_obj
+
+    async def create_async(
+        self, db: AsyncSession, *, obj_in: PermissionCreate, organization_id: int
+    ) -> Permission:
+        db_obj = Permission(
+            name=obj_in.name,
+            description=obj_in.description,
+            organization_id=organization_id
+        )
+        db.add(db_obj)
+        await db.flush()
         return db_obj
 
     def get_multi_by_organization(
@@ -32,5 +45,21 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
             .limit(limit)\
             .all()
 
+    async def get_multi_by_organization_async(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Permission]:
+        result = await db.scalars(
+            select(Permission)
+            .where(Permission.organization_id == organization_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result)
+
 
 permission = CRUDPermission(Permission)
@@ -1,10 +1,15 @@
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
 from app.models.role import Role
 from app.models.permission import Permission
-from app.schemas.role import RoleCreate, RoleUpdate
+from app.models.associations import role_permissions
+from app.core.responses import projection
+from app.schemas.permission import PermissionResponse
+from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse
 
 
 class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
@@ -23,8 +28,29 @@ class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
             db_obj.permissions = permissions
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
+        return db_obj
+
+    async def create_async(
+        self, db: AsyncSession, *, obj_in: RoleCreate, organization_id: int
+    ) -> Role:
+        db_obj = Role(
+            name=obj_in.name,
+            description=obj_in.description,
+            organization_id=organization_id
+        )
+        
+        # Always set the collection so it never needs a lazy load
+        db_obj.permissions = []
+        if obj_in.permission_ids:
+            result = await db.scalars(select(Permission).where(
+                Permission.id.in_(obj_in.permission_ids),
+                Permission.organization_id == organization_id
+            ))
+            db_obj.permissions = list(result)
+        
+        db.add(db_obj)
+        await db.flush()
         return db_obj
 
     def get_multi_by_organization(
@@ -41,5 +67,59 @@ class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
             .limit(limit)\
             .all()
 
+    def get_rows_by_organization(
+        self,
+        db: Session,
+        *,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        RoleResponse-shaped dicts: one query for the roles and, unless a
+        sparse `fields` set leaves them out, one for their permissions.
+        """
+        roles = self.get_rows(
+            db, RoleResponse, Role.organization_id == organization_id,
+            skip=skip, limit=limit, fields=fields
+        )
+        if not roles or (fields is not None and "permissions" not in fields):
+            return roles
+        by_id = {}
+        for row in roles:
+            row["permissions"] = []
+            by_id[row["id"]] = row
+        result = db.execute(self._permissions_statement(list(by_id)))
+        for row in result.mappings():
+            permission = dict(row)
+            by_id[permission.pop("role_id")]["permissions"].append(permission)
+        return roles
+
+    @staticmethod
+    def _permissions_statement(role_ids: List[int]):
+        return (
+            select(role_permissions.c.role_id, *projection(Permission, PermissionResponse))
+            .join(Permission, Permission.id == role_permissions.c.permission_id)
+            .where(role_permissions.c.role_id.in_(role_ids))
+            .order_by(role_permissions.c.role_id, Permission.id)
+        )
+
+    async def get_multi_by_organization_async(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Role]:
+        result = await db.scalars(
+            select(Role)
+            .where(Role.organization_id == organization_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result)
+
 
 role = CRUDRole(Role)
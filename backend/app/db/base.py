@@ -5,3 +5,8 @@ from app.models.join_request import JoinRequest
 from app.models.invitation import Invitation
 from app.models.role import Role
 from app.models.permission import Permission
+from app.models.permission_mask import MembershipPermissionMask
+from app.models.email_outbox import EmailOutbox
+from app.models.job import Job
+from app.models.stats_counter import StatsCounter
+from app.models.activity_event import ActivityEvent
@@ -1,13 +1,67 @@
+import time
+from typing import AsyncGenerator, Generator
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import pool_wait_seconds
 
-engine = create_engine(settings.DATABASE_URL)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+    metrics_label = ("sync",)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_seconds.observe(self.metrics_label, time.perf_counter() - started)
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    metrics_label = ("async",)
+
+
+def _pool_options(url: str, poolclass: type) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    **_pool_options(settings.DATABASE_URL, TimedQueuePool)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db():
+# Async stack for `async def` endpoints. Objects stay usable after commit,
+# since lazy refreshes cannot run implicitly on an AsyncSession.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    **_pool_options(settings.async_database_url, TimedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """Request-scoped session, committed by UnitOfWorkRoute when the endpoint succeeds"""
     db = SessionLocal()
+    request.state.db = db
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        request.state.async_db = db
+        yield db
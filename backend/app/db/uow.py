@@ -0,0 +1,60 @@
+from typing import Any, Callable, Coroutine, Union
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """
+    Commits `session` when the block exits cleanly and rolls back otherwise.
+    Works as `with UnitOfWork(db):` for a Session and `async with` for an
+    AsyncSession. CRUD methods only flush, so everything inside the block is
+    one transaction.
+    """
+
+    def __init__(self, session: Union[Session, AsyncSession]):
+        self.session = session
+
+    def __enter__(self) -> Session:
+        return self.session
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.session.commit()
+        else:
+            self.session.rollback()
+
+    async def __aenter__(self) -> AsyncSession:
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.session.commit()
+        else:
+            await self.session.rollback()
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Route that commits the request's sessions once the endpoint has returned
+    and its response is serialized, but before anything is sent. Endpoints
+    that raise leave their session to be rolled back when it is closed.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            db = getattr(request.state, "db", None)
+            if db is not None and db.in_transaction():
+                await run_in_threadpool(db.commit)
+            async_db = getattr(request.state, "async_db", None)
+            if async_db is not None and async_db.in_transaction():
+                await async_db.commit()
+            return response
+
+        return route_handler
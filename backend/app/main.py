@@ -1,11 +1,24 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.api import metrics
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.metrics import MetricsMiddleware
+from app.core.responses import DefaultResponse
+from app.core.query_stats import query_stats_middleware
+from app.db.session import async_engine
+from app.utils import stats  # registers the stats counter listeners
+from app.utils import content_version  # registers the content version listeners
+from app.utils.activity import run_activity_writer
+from app.utils.jobs import recover_jobs, shutdown_jobs
+from app.utils.outbox import run_dispatcher
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=DefaultResponse
 )
 
 # Configure CORS
@@ -20,6 +33,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Query-Count", "X-DB-Time-Ms", "ETag"],
 )
 
+app.middleware("http")(query_stats_middleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router)
+
+@app.on_event("shutdown")
+def shutdown_password_hasher() -> None:
+    password_hasher.shutdown()
+
+@app.on_event("startup")
+def recover_job_queue() -> None:
+    # Jobs cancelled or interrupted by the last shutdown
+    recover_jobs()
+
+@app.on_event("shutdown")
+def shutdown_job_workers() -> None:
+    shutdown_jobs()
+
+@app.on_event("startup")
+async def start_activity_writer() -> None:
+    app.state.activity_writer_stop = asyncio.Event()
+    app.state.activity_writer = asyncio.create_task(
+        run_activity_writer(app.state.activity_writer_stop)
+    )
+
+@app.on_event("shutdown")
+async def stop_activity_writer() -> None:
+    # Registered before dispose_async_engine so buffered events are written first
+    app.state.activity_writer_stop.set()
+    await app.state.activity_writer
+
+@app.on_event("shutdown")
+async def dispose_async_engine() -> None:
+    await async_engine.dispose()
+
+@app.on_event("startup")
+async def start_email_dispatcher() -> None:
+    if settings.EMAIL_DISPATCHER_IN_PROCESS:
+        app.state.email_dispatcher_stop = asyncio.Event()
+        app.state.email_dispatcher = asyncio.create_task(
+            run_dispatcher(app.state.email_dispatcher_stop)
+        )
+
+@app.on_event("shutdown")
+async def stop_email_dispatcher() -> None:
+    task = getattr(app.state, "email_dispatcher", None)
+    if task is not None:
+        app.state.email_dispatcher_stop.set()
+        await task
@@ -6,6 +6,11 @@ from .permission import Permission
 from .user_organization import UserOrganization
 from .join_request import JoinRequest
 from .invitation import Invitation
+from .permission_mask import MembershipPermissionMask
+from .email_outbox import EmailOutbox
+from .job import Job
+from .stats_counter import StatsCounter
+from .activity_event import ActivityEvent
 from .associations import role_permissions, user_roles
 from .enums import UserStatus
 
@@ -19,6 +24,11 @@ __all__ = [
     "UserOrganization",
     "JoinRequest",
     "Invitation",
+    "MembershipPermissionMask",
+    "EmailOutbox",
+    "Job",
+    "StatsCounter",
+    "ActivityEvent",
     "role_permissions",
     "user_roles",
     "UserStatus"
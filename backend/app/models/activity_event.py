@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, JSON, Index, PrimaryKeyConstraint, Sequence
+from sqlalchemy.ext.compiler import compiles
+from app.db.base_class import Base
+from datetime import datetime
+
+class ActivityEvent(Base):
+    """Append-only audit event about an organization member.
+
+    The table is range-partitioned by month on `ts`, so the primary key
+    includes it on PostgreSQL; SQLite keeps `id` alone as its key so that
+    it is assigned on insert. Rows are written in batches by
+    app.utils.activity.
+    """
+    __tablename__ = "activity_events"
+    __table_args__ = (
+        Index("ix_activity_events_org_user_ts", "organization_id", "user_id", "ts", "id"),
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), Sequence("activity_events_id_seq"), primary_key=True)
+    ts = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    organization_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)  # Member the event is about
+    actor_id = Column(Integer, nullable=True)  # Member who caused it, if any
+    action = Column(String, nullable=False)  # e.g. member.invited, member.roles_updated
+    details = Column(JSON, nullable=True)
+
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _sqlite_primary_key(constraint, compiler, **kw):
+    # SQLite only assigns ids to a lone INTEGER PRIMARY KEY (the rowid)
+    if constraint.table is ActivityEvent.__table__:
+        return "PRIMARY KEY (id)"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.db.base_class import Base
+from app.models.base import TimestampMixin
+from datetime import datetime
+
+class EmailOutbox(Base, TimestampMixin):
+    """Email waiting to be delivered by the outbox dispatcher.
+
+    Rows are written in the same transaction as the change that triggers the
+    email, so a committed invitation always has its email queued.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # invitation, join_request_notification, join_request_status, reset_password
+    recipient = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
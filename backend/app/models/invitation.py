@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from app.models.base import TimestampMixin
@@ -6,6 +6,21 @@ from datetime import datetime, timezone
 
 class Invitation(Base, TimestampMixin):
     __tablename__ = "invitations"
+    __table_args__ = (
+        Index('ix_invitations_organization_id', 'organization_id'),
+        # Pending-invitation lookups by (organization, email) skip accepted rows
+        Index(
+            'ix_invitations_pending_org_email_expires',
+            'organization_id', 'email', 'expires_at',
+            postgresql_where=text('is_accepted = false')
+        ),
+        # Pending-invitation counts range over the unexpired rows only
+        Index(
+            'ix_invitations_pending_expires_org',
+            'expires_at', 'organization_id',
+            postgresql_where=text('is_accepted = false')
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, nullable=False, index=True)
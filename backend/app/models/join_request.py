@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from app.models.base import TimestampMixin
 
 class JoinRequest(Base, TimestampMixin):
     __tablename__ = "join_requests"
+    __table_args__ = (
+        Index('ix_join_requests_organization_id_status', 'organization_id', 'status'),
+        Index('ix_join_requests_user_id_organization_id', 'user_id', 'organization_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
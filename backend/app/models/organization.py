@@ -10,6 +10,8 @@ class Organization(Base, TimestampMixin):
     name = Column(String, unique=True, index=True)
     industry = Column(String)
     description = Column(String, nullable=True)
+    authz_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on role/permission/membership changes
+    content_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every write to the org's members, roles, permissions, invitations and join requests; drives ETags
     
     users = relationship(
         "User",
@@ -14,7 +14,8 @@ class Permission(Base, TimestampMixin):
     name = Column(String, index=True)
     description = Column(String)
     category = Column(String, nullable=False, default="other")
-    organization_id = Column(Integer, ForeignKey('organizations.id'), nullable=False)
+    organization_id = Column(Integer, ForeignKey('organizations.id'), nullable=False, index=True)
+    bit_position = Column(Integer, nullable=True)  # Assigned by the permission index
     
     roles = relationship("Role", secondary=role_permissions, back_populates="permissions")
     organization = relationship("Organization", back_populates="permissions")
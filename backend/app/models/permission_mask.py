@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary
+from app.db.base_class import Base
+from app.models.base import TimestampMixin
+
+class MembershipPermissionMask(Base, TimestampMixin):
+    """Compiled effective permissions of a user in an organization.
+
+    `mask` has bit `Permission.bit_position` set for every permission granted
+    through the user's membership roles.
+    """
+    __tablename__ = "membership_permission_masks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    mask = Column(LargeBinary, nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+from app.db.base_class import Base
+from app.models.base import TimestampMixin
+
+# organization_id used for counters that span every organization
+GLOBAL_SCOPE = 0
+
+class StatsCounter(Base, TimestampMixin):
+    """Running count kept in step with writes; see app.utils.stats"""
+    __tablename__ = "stats_counters"
+
+    organization_id = Column(Integer, primary_key=True)  # GLOBAL_SCOPE for totals
+    name = Column(String, primary_key=True)  # users, organizations, members, roles, pending_join_requests
+    value = Column(BigInteger, nullable=False, default=0)
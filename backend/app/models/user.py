@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, func, Enum as SQLEnum
+from sqlalchemy.orm import relationship, object_session
 from app.db.base_class import Base
 from app.models.base import TimestampMixin
 from app.models.enums import UserStatus
@@ -33,19 +33,12 @@ class User(Base, TimestampMixin):
         """Check if user has a specific permission in an organization"""
         if self.is_superuser:
             return True
-            
-        # Find user's organization membership
-        org_membership = next(
-            (org for org in self.user_organizations if org.organization_id == organization_id),
-            None
-        )
-        
-        if not org_membership:
-            return False
-            
-        # Check if any of the user's roles have the required permission
-        for role in org_membership.roles:
-            if any(perm.name == permission_name for perm in role.permissions):
-                return True
-                
-        return False
+
+        # Imported here to avoid a models <-> utils import cycle
+        from app.utils.permission_index import cached_permission
+        return bool(cached_permission(
+            object_session(self), self.id, organization_id, permission_name
+        ))
+
+# Case-insensitive email lookups (member import)
+Index("ix_users_email_lower", func.lower(User.email))
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from app.models.base import TimestampMixin
 
 class UserOrganization(Base, TimestampMixin):
     __tablename__ = "user_organizations"
+    __table_args__ = (
+        UniqueConstraint('user_id', 'organization_id', name='uix_user_organization'),
+        Index('ix_user_organizations_organization_id_role_id', 'organization_id', 'role_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'))
@@ -6,3 +6,5 @@ from .permission import PermissionResponse, PermissionCreate, PermissionUpdate
 from .role import RoleResponse, RoleCreate, RoleUpdate
 from .invitation import InvitationCreate, InvitationResponse
 from .join_request import JoinRequest, JoinRequestCreate, JoinRequestUpdate
+from .job import JobResponse
+from .activity import ActivityEventResponse
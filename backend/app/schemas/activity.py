@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, Optional
+
+class ActivityEventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    ts: datetime
+    organization_id: int
+    user_id: int
+    actor_id: Optional[int] = None
+    action: str
+    details: Optional[Any] = None
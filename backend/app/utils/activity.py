@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.models.activity_event import ActivityEvent
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBuffer:
+    """
+    In-memory ring buffer of activity events drained by `run_activity_writer`.
+    `record` never touches the database and is safe from any thread; when the
+    buffer is full the oldest events are dropped and counted.
+    **Parameters**
+    * `maxlen`: Events kept before dropping the oldest
+    * `batch_size`: Buffered events that wake the writer early
+    """
+
+    def __init__(self, maxlen: int, batch_size: int):
+        self.batch_size = batch_size
+        self._events: deque = deque(maxlen=maxlen)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> asyncio.Event:
+        """Bind the writer's loop; returns the event set when a batch is ready"""
+        self._loop, self._wake = loop, asyncio.Event()
+        return self._wake
+
+    def detach(self) -> None:
+        self._loop = self._wake = None
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(entry)
+        self.recorded += 1
+        loop, wake = self._loop, self._wake
+        if len(self._events) >= self.batch_size and loop is not None:
+            loop.call_soon_threadsafe(wake.set)
+
+    def drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while self._events and len(batch) < limit:
+            batch.append(self._events.popleft())
+        return batch
+
+    def requeue(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Put a failed batch back at the front, oldest first. Events recorded
+        meanwhile may leave too little room; the batch's oldest events are
+        then the oldest overall, so those are dropped and counted.
+        """
+        overflow = len(batch) - (self._events.maxlen - len(self._events))
+        if overflow > 0:
+            self.dropped += overflow
+            batch = batch[overflow:]
+        self._events.extendleft(reversed(batch))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._events),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "written": self.written,
+        }
+
+
+activity_buffer = ActivityBuffer(
+    maxlen=settings.ACTIVITY_BUFFER_SIZE,
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+)
+
+
+def log_activity(
+    db: Session,
+    *,
+    organization_id: int,
+    user_id: int,
+    action: str,
+    actor_id: Optional[int] = None,
+    **details: Any
+) -> None:
+    """
+    Queue an event that is buffered once `db` commits and discarded if it
+    rolls back. Pass `db.sync_session` from an AsyncSession.
+    """
+    db.info.setdefault("pending_activity", []).append({
+        "ts": datetime.utcnow(),
+        "organization_id": organization_id,
+        "user_id": user_id,
+        "actor_id": actor_id,
+        "action": action,
+        "details": details or None,
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _buffer_committed_activity(session: Session) -> None:
+    for pending in session.info.pop("pending_activity", ()):
+        activity_buffer.record(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_activity(session: Session) -> None:
+    session.info.pop("pending_activity", None)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+_partitions: Set[date] = set()
+
+
+async def ensure_partitions(connection: AsyncConnection, until: date) -> None:
+    """Create monthly partitions from the current month through `until`"""
+    if connection.dialect.name != "postgresql":
+        return
+    month = _month_start(date.today())
+    while month <= until:
+        if month not in _partitions:
+            await connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS activity_events_{month:%Y_%m} "
+                f"PARTITION OF activity_events "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_month_start(month, 1).isoformat()}')"
+            ))
+            _partitions.add(month)
+        month = _month_start(month, 1)
+
+
+async def flush_activity(limit: Optional[int] = None) -> int:
+    """Write one batch of buffered events with a multi-row insert"""
+    batch = activity_buffer.drain(limit or settings.ACTIVITY_BATCH_SIZE)
+    if not batch:
+        return 0
+    try:
+        async with async_engine.begin() as connection:
+            await ensure_partitions(
+                connection,
+                _month_start(max(entry["ts"] for entry in batch).date())
+            )
+            await connection.execute(insert(ActivityEvent), batch)
+    except Exception:
+        activity_buffer.requeue(batch)
+        raise
+    activity_buffer.written += len(batch)
+    return len(batch)
+
+
+async def run_activity_writer(stop: asyncio.Event) -> None:
+    """Flush the buffer whenever a batch fills up or ACTIVITY_FLUSH_SECONDS pass"""
+    wake = activity_buffer.attach(asyncio.get_running_loop())
+    try:
+        async with async_engine.begin() as connection:
+            await ensure_partitions(
+                connection,
+                _month_start(date.today(), settings.ACTIVITY_PARTITION_MONTHS_AHEAD)
+            )
+    except Exception:
+        logger.exception("Could not create activity partitions ahead of time")
+    while True:
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=settings.ACTIVITY_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        wake.clear()
+        try:
+            while await flush_activity() >= settings.ACTIVITY_BATCH_SIZE:
+                pass
+        except Exception:
+            logger.exception("Activity batch write failed")
+        if stop.is_set():
+            break
+    # Drain whatever arrived before shutdown
+    try:
+        while await flush_activity():
+            pass
+    except Exception:
+        logger.exception("Activity flush on shutdown failed; %d events lost", len(activity_buffer))
+    activity_buffer.detach()
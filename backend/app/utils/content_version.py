@@ -0,0 +1,126 @@
+from typing import Optional, Set
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.invitation import Invitation
+from app.models.join_request import JoinRequest
+from app.models.organization import Organization
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_organization import UserOrganization
+
+# Writes to these bump their organization's content_version, as do writes
+# to the organization itself
+VERSIONED_MODELS = (UserOrganization, Role, Permission, Invitation, JoinRequest)
+
+
+def touch_organization(db: Session, organization_id: int) -> None:
+    """
+    Mark an organization's content as changed; its content_version is
+    bumped once when `db` commits. ORM writes are tracked automatically;
+    Core bulk statements must call this themselves. Pass `db.sync_session`
+    from an AsyncSession.
+    """
+    db.info.setdefault("touched_organizations", set()).add(organization_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context) -> None:
+    organizations: Set[int] = session.info.setdefault("touched_organizations", set())
+    users: Set[int] = session.info.setdefault("touched_users", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, VERSIONED_MODELS):
+            if obj.organization_id is not None:
+                organizations.add(obj.organization_id)
+        elif isinstance(obj, Organization) and obj.id is not None:
+            organizations.add(obj.id)
+        elif isinstance(obj, User) and obj.id is not None:
+            # Member names and status appear in every organization's member list
+            users.add(obj.id)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_content_versions(session: Session) -> None:
+    # Flush first so changes still pending at commit are counted too
+    session.flush()
+    organizations = session.info.pop("touched_organizations", set())
+    users = session.info.pop("touched_users", set())
+    if users:
+        organizations.update(session.scalars(
+            select(UserOrganization.organization_id).distinct().where(
+                UserOrganization.user_id.in_(users),
+                UserOrganization.organization_id.is_not(None)
+            )
+        ))
+    if organizations:
+        session.execute(
+            update(Organization)
+            .where(Organization.id.in_(sorted(organizations)))
+            .values(content_version=Organization.content_version + 1),
+            execution_options={"synchronize_session": False}
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched(session: Session) -> None:
+    session.info.pop("touched_organizations", None)
+    session.info.pop("touched_users", None)
+
+
+def _etag(organization_id: int, version: Optional[int]) -> str:
+    return f'W/"org-{organization_id}-v{version}"'
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison: W/"x" and "x" match
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in header.split(","))
+
+
+def _conditional(
+    request: Request, response: Response, organization_id: int, version: Optional[int]
+) -> Optional[int]:
+    if version is None:
+        return None
+    etag = _etag(organization_id, version)
+    if _matches(request, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return version
+
+
+def check_not_modified(
+    db: Session, request: Request, response: Response, organization_id: int
+) -> Optional[int]:
+    """
+    Answer a conditional GET for tenant-scoped content: raise 304 when the
+    client's If-None-Match still matches the organization's content_version,
+    otherwise set the ETag on `response` and return the version (None for
+    an unknown organization). Call it after authorization and before the
+    query it saves.
+    """
+    version = db.scalar(select(Organization.content_version).where(Organization.id == organization_id))
+    return _conditional(request, response, organization_id, version)
+
+
+async def check_not_modified_async(
+    db: AsyncSession, request: Request, response: Response, organization_id: int
+) -> Optional[int]:
+    version = await db.scalar(select(Organization.content_version).where(Organization.id == organization_id))
+    return _conditional(request, response, organization_id, version)
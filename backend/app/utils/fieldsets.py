@@ -0,0 +1,28 @@
+from typing import FrozenSet, Iterable, Optional
+
+from fastapi import HTTPException, Query
+
+# Returned whatever `fields` asks for; list endpoints page and join on it
+ALWAYS_INCLUDED = frozenset({"id"})
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return; `id` is always included. Defaults to every field.",
+)
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a `fields=a,b,c` sparse fieldset against the resource's whitelist.
+    Returns None when no fieldset was requested.
+    """
+    if fields is None:
+        return None
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested - frozenset(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return requested | ALWAYS_INCLUDED
@@ -0,0 +1,133 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Reports (done, total) for the running job
+ProgressCallback = Callable[[int, Optional[int]], None]
+JobHandler = Callable[[Session, Dict[str, Any], ProgressCallback], Any]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+_executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register `fn(db, params, progress)` as the handler for jobs of `kind`"""
+    def register(fn: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def submit_job(
+    db: Session,
+    *,
+    organization_id: int,
+    kind: str,
+    params: Dict[str, Any],
+    created_by_id: Optional[int] = None,
+    total: Optional[int] = None
+) -> Job:
+    """
+    Add a job to the caller's unit of work; it is handed to the worker pool
+    once that commits, so a worker never looks for an uncommitted job
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(
+        organization_id=organization_id,
+        created_by_id=created_by_id,
+        kind=kind,
+        params=params,
+        progress_total=total,
+    )
+    db.add(job)
+    db.flush()
+    job_id = job.id
+    event.listen(db, "after_commit", lambda session: _executor.submit(run_job, job_id), once=True)
+    return job
+
+
+def _update_job(job_id: int, **values: Any) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_job(job_id: int) -> None:
+    """Claim a queued job and run its handler in a dedicated session"""
+    db = SessionLocal()
+    try:
+        claimed = db.query(Job).filter(Job.id == job_id, Job.status == "queued").update(
+            {Job.status: "running", Job.started_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(Job, job_id)
+
+        def progress(done: int, total: Optional[int] = None) -> None:
+            values = {"progress_done": done}
+            if total is not None:
+                values["progress_total"] = total
+            _update_job(job_id, **values)
+
+        try:
+            # Handlers only flush; the job's session commits their work here
+            result = JOB_HANDLERS[job.kind](db, dict(job.params), progress)
+            db.commit()
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, job.kind)
+            db.rollback()
+            _update_job(job_id, status="failed", error=str(e)[:1000], finished_at=datetime.utcnow())
+        else:
+            _update_job(job_id, status="succeeded", result=result, finished_at=datetime.utcnow())
+    finally:
+        db.close()
+
+
+def recover_jobs() -> int:
+    """
+    Pick up jobs left behind by a previous process: fail `running` jobs that
+    have not reported progress for JOB_STALE_AFTER_SECONDS and resubmit the
+    `queued` ones. Claims are atomic, so several processes may recover at
+    once. Returns the number of jobs resubmitted.
+    """
+    db = SessionLocal()
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        stale = db.query(Job).filter(Job.status == "running", Job.updated_at < cutoff).update(
+            {
+                Job.status: "failed",
+                Job.error: "Interrupted before completion",
+                Job.finished_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        queued = db.scalars(select(Job.id).where(Job.status == "queued").order_by(Job.id)).all()
+        db.commit()
+    finally:
+        db.close()
+    if stale:
+        logger.warning("Marked %d interrupted job(s) failed", stale)
+    for job_id in queued:
+        _executor.submit(run_job, job_id)
+    return len(queued)
+
+
+def shutdown_jobs() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.utils.email import (
+    send_invitation_email,
+    send_join_request_notification,
+    send_join_request_status_update,
+    send_reset_password_email,
+)
+from app.utils.smtp import smtp_pool
+
+logger = logging.getLogger(__name__)
+
+# Payload keys that must not outlive delivery
+SENSITIVE_KEYS = {"temp_password", "token"}
+
+EMAIL_SENDERS: Dict[str, Callable[[str, Dict[str, Any]], Awaitable[None]]] = {
+    "invitation": lambda recipient, payload: send_invitation_email(
+        recipient, payload["inviter_name"], payload["org_id"],
+        payload.get("temp_password"), payload.get("token")
+    ),
+    "join_request_notification": lambda recipient, payload: send_join_request_notification(
+        recipient, payload["user_name"], payload["organization_name"]
+    ),
+    "join_request_status": lambda recipient, payload: send_join_request_status_update(
+        recipient, payload["organization_name"], payload["status"]
+    ),
+    "reset_password": lambda recipient, payload: send_reset_password_email(
+        recipient, payload["email"], payload["token"]
+    ),
+}
+
+
+def enqueue_email(db: Session, kind: str, recipient: str, **payload: Any) -> EmailOutbox:
+    """Queue an email in the caller's transaction; it is sent once committed"""
+    if kind not in EMAIL_SENDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    message = EmailOutbox(kind=kind, recipient=recipient, payload=payload)
+    db.add(message)
+    return message
+
+
+def pending_count(db: Session) -> int:
+    """Number of emails waiting for delivery"""
+    return db.query(func.count(EmailOutbox.id)).filter(EmailOutbox.status == "pending").scalar()
+
+
+def _scrub(message: EmailOutbox) -> None:
+    message.payload = {
+        key: value for key, value in message.payload.items() if key not in SENSITIVE_KEYS
+    }
+
+
+def _claim_batch(db: Session, batch_size: int) -> List[EmailOutbox]:
+    return (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= datetime.utcnow())
+        .order_by(EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def _record_results(db: Session, messages: List[EmailOutbox], results: List[Any]) -> None:
+    for message, error in zip(messages, results):
+        if isinstance(error, Exception):
+            message.attempts += 1
+            message.last_error = str(error)[:1000]
+            if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                message.status = "dead"
+                _scrub(message)
+                logger.error("Email %s dead-lettered after %d attempts: %s", message.id, message.attempts, error)
+            else:
+                delay = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (message.attempts - 1)
+                message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                logger.warning("Email %s failed (attempt %d), retrying in %ss: %s", message.id, message.attempts, delay, error)
+        else:
+            message.status = "sent"
+            message.sent_at = datetime.utcnow()
+            _scrub(message)
+    db.commit()
+
+
+async def dispatch_batch(db: Session, batch_size: Optional[int] = None) -> int:
+    """Deliver one batch of due emails. Returns the number of rows processed.
+
+    Rows are locked with SKIP LOCKED so several dispatchers can share the
+    outbox. Delivery is at-least-once: a crash mid-batch leaves the rows
+    pending for the next run. The blocking database work runs in the
+    threadpool so sends on the event loop are not held up by it.
+    """
+    messages = await run_in_threadpool(_claim_batch, db, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    # Submit the whole batch concurrently over the pooled SMTP connections
+    results = await asyncio.gather(
+        *(EMAIL_SENDERS[message.kind](message.recipient, message.payload) for message in messages),
+        return_exceptions=True
+    )
+    await run_in_threadpool(_record_results, db, messages, results)
+    return len(messages)
+
+
+async def run_dispatcher(stop: Optional[asyncio.Event] = None) -> None:
+    """Drain the outbox until `stop` is set, sleeping when it is empty"""
+    stop = stop or asyncio.Event()
+    try:
+        await _dispatch_until(stop)
+    finally:
+        await smtp_pool.close()
+
+
+async def _dispatch_until(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            processed = await dispatch_batch(db)
+        except Exception:
+            logger.exception("Email dispatcher batch failed")
+            await run_in_threadpool(db.rollback)
+            processed = 0
+        finally:
+            await run_in_threadpool(db.close)
+        if processed < settings.EMAIL_OUTBOX_BATCH_SIZE:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
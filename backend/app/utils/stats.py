@@ -0,0 +1,181 @@
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from sqlalchemy import event, false, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.invitation import Invitation
+from app.models.join_request import JoinRequest
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.stats_counter import GLOBAL_SCOPE, StatsCounter
+from app.models.user import User
+from app.models.user_organization import UserOrganization
+
+logger = logging.getLogger(__name__)
+
+# Per-organization counters whose global totals are summed at read time;
+# keeping them in global rows would make every tenant's writes queue on
+# the same row lock
+GLOBAL_TOTALS = {"roles", "pending_join_requests"}
+
+CounterKey = Tuple[int, str]
+
+
+def _write(connection: Connection, values: Dict[CounterKey, int], increment: bool) -> None:
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[connection.dialect.name]
+    statement = dialect_insert(StatsCounter).values([
+        {"organization_id": organization_id, "name": name, "value": value}
+        for (organization_id, name), value in values.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=["organization_id", "name"],
+        set_={
+            "value": StatsCounter.value + statement.excluded.value if increment else statement.excluded.value,
+            "updated_at": statement.excluded.updated_at,
+        }
+    )
+    connection.execute(statement)
+
+
+def bump_counters(
+    db: Union[Session, Connection], organization_id: Optional[int] = None, **deltas: int
+) -> None:
+    """
+    Add `deltas` to the organization's counters, or to the global ones when
+    `organization_id` is None, in the caller's transaction. ORM inserts and
+    deletes are counted by the listeners below; Core bulk statements must
+    call this themselves.
+    """
+    scope = GLOBAL_SCOPE if organization_id is None else organization_id
+    changes: Dict[CounterKey, int] = {(scope, name): delta for name, delta in deltas.items() if delta}
+    if changes:
+        _write(db.connection() if isinstance(db, Session) else db, changes, increment=True)
+
+
+def read_counters(db: Session, organization_id: int = GLOBAL_SCOPE) -> Dict[str, int]:
+    """
+    All counters of one scope in a single primary-key range read. The
+    global scope also sums GLOBAL_TOTALS over the organizations' rows.
+    """
+    rows = db.execute(
+        select(StatsCounter.name, StatsCounter.value)
+        .where(StatsCounter.organization_id == organization_id)
+    )
+    counters = {name: value for name, value in rows}
+    if organization_id == GLOBAL_SCOPE:
+        totals = db.execute(
+            select(StatsCounter.name, func.sum(StatsCounter.value))
+            .where(StatsCounter.organization_id != GLOBAL_SCOPE, StatsCounter.name.in_(GLOBAL_TOTALS))
+            .group_by(StatsCounter.name)
+        )
+        counters.update((name, int(total)) for name, total in totals)
+    return counters
+
+
+def count_pending_invitations(db: Session, organization_id: Optional[int] = None) -> int:
+    """
+    Unaccepted invitations that have not expired, all organizations' when
+    `organization_id` is None. Invitations expire without a write, so this
+    cannot be a maintained counter; the partial index on expires_at keeps
+    the count proportional to the live invitations.
+    """
+    statement = select(func.count()).select_from(Invitation).where(
+        Invitation.is_accepted == false(),
+        Invitation.expires_at > datetime.utcnow()
+    )
+    if organization_id is not None:
+        statement = statement.where(Invitation.organization_id == organization_id)
+    return db.scalar(statement)
+
+
+def reconcile_counters(db: Session) -> Dict[CounterKey, int]:
+    """
+    Recompute every counter from the source tables and overwrite drift.
+    Returns the corrections applied, keyed by (organization_id, name).
+    """
+    actual: Dict[CounterKey, int] = {
+        (GLOBAL_SCOPE, "users"): db.scalar(select(func.count(User.id))),
+        (GLOBAL_SCOPE, "organizations"): db.scalar(select(func.count(Organization.id))),
+    }
+    per_organization = {
+        "members": select(UserOrganization.organization_id, func.count())
+            .group_by(UserOrganization.organization_id),
+        "roles": select(Role.organization_id, func.count())
+            .group_by(Role.organization_id),
+        "pending_join_requests": select(JoinRequest.organization_id, func.count())
+            .where(JoinRequest.status == "pending")
+            .group_by(JoinRequest.organization_id),
+    }
+    for name, statement in per_organization.items():
+        for organization_id, count in db.execute(statement):
+            if organization_id is not None:
+                actual[(organization_id, name)] = count
+
+    stored = {
+        (organization_id, name): value
+        for organization_id, name, value in db.execute(
+            select(StatsCounter.organization_id, StatsCounter.name, StatsCounter.value)
+        )
+    }
+    corrections = {
+        key: actual.get(key, 0) - stored.get(key, 0)
+        for key in set(actual) | set(stored)
+        if actual.get(key, 0) != stored.get(key, 0)
+    }
+    if corrections:
+        logger.warning("Reconciled %d drifted stats counters", len(corrections))
+        _write(db.connection(), {key: actual.get(key, 0) for key in corrections}, increment=False)
+    return corrections
+
+
+def _pending_delta(target, attribute: str, is_pending: Callable[[Any], bool]) -> int:
+    """-1, 0 or +1 as an update moves a row out of or into the pending state"""
+    history = inspect(target).attrs[attribute].history
+    if not history.has_changes():
+        return 0
+    before = history.deleted[0] if history.deleted else None
+    return int(is_pending(getattr(target, attribute))) - int(is_pending(before))
+
+
+def _is_pending_request(status: Optional[str]) -> bool:
+    return (status or "pending") == "pending"
+
+
+def _count_inserts_and_deletes(model, counter: str, scoped: bool) -> None:
+    def inserted(mapper, connection, target) -> None:
+        bump_counters(connection, target.organization_id if scoped else None, **{counter: 1})
+
+    def deleted(mapper, connection, target) -> None:
+        bump_counters(connection, target.organization_id if scoped else None, **{counter: -1})
+
+    event.listen(model, "after_insert", inserted)
+    event.listen(model, "after_delete", deleted)
+
+
+_count_inserts_and_deletes(User, "users", scoped=False)
+_count_inserts_and_deletes(Organization, "organizations", scoped=False)
+_count_inserts_and_deletes(UserOrganization, "members", scoped=True)
+_count_inserts_and_deletes(Role, "roles", scoped=True)
+
+
+@event.listens_for(JoinRequest, "after_insert")
+def _join_request_inserted(mapper, connection, target) -> None:
+    if _is_pending_request(target.status):
+        bump_counters(connection, target.organization_id, pending_join_requests=1)
+
+
+@event.listens_for(JoinRequest, "after_update")
+def _join_request_updated(mapper, connection, target) -> None:
+    delta = _pending_delta(target, "status", _is_pending_request)
+    bump_counters(connection, target.organization_id, pending_join_requests=delta)
+
+
+@event.listens_for(JoinRequest, "after_delete")
+def _join_request_deleted(mapper, connection, target) -> None:
+    if _is_pending_request(target.status):
+        bump_counters(connection, target.organization_id, pending_join_requests=-1)
+
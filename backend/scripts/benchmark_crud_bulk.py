@@ -0,0 +1,84 @@
+import sys
+import os
+import argparse
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base, Organization, Permission
+from app.crud.permission import permission
+from app.schemas.permission import PermissionCreate
+
+def timed(label: str, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-row CRUD calls with the *_many operations")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+
+    organization = Organization(name="Benchmark")
+    db.add(organization)
+    db.commit()
+    org_id = organization.id
+    rows = [
+        {"name": f"perm_{i}", "description": "benchmark", "category": "other", "organization_id": org_id}
+        for i in range(args.rows)
+    ]
+
+    def reset() -> None:
+        db.execute(delete(Permission).where(Permission.organization_id == org_id))
+        db.commit()
+        db.expunge_all()
+
+    print(f"{args.rows} rows on {engine.dialect.name}")
+
+    def create_loop() -> None:
+        for row in rows:
+            # What every create() used to do: commit and refresh per row
+            db_obj = permission.create(db, obj_in=PermissionCreate(**row), organization_id=org_id)
+            db.commit()
+            db.refresh(db_obj)
+    loop_create = timed("create() + commit per row", create_loop)
+    ids = [p.id for p in permission.get_multi_by_organization(db, organization_id=org_id, limit=args.rows)]
+    db.expunge_all()
+
+    loop_get = timed("get() per id", lambda: [permission.get(db, id) for id in ids])
+    db.expunge_all()
+    many_get = timed("get_many()", lambda: permission.get_many(db, ids))
+    reset()
+
+    def create_bulk() -> None:
+        permission.create_many(db, objs_in=rows)
+        db.commit()
+    many_create = timed("create_many() + one commit", create_bulk)
+
+    def update_bulk() -> None:
+        permission.update_many(db, ids=ids, obj_in={"description": "updated"})
+        db.commit()
+    ids = [p.id for p in permission.get_multi_by_organization(db, organization_id=org_id, limit=args.rows)]
+    timed("update_many() + one commit", update_bulk)
+
+    def upsert_bulk() -> None:
+        permission.upsert_many(db, objs_in=rows, index_elements=["name", "organization_id"])
+        db.commit()
+    timed("upsert_many() over existing rows", upsert_bulk)
+
+    print(f"create speedup: {loop_create / many_create:.1f}x, get speedup: {loop_get / many_get:.1f}x")
+    db.close()
+
+if __name__ == "__main__":
+    main()
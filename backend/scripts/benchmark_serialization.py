@@ -0,0 +1,87 @@
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from typing import List
+
+from app.db.base import Base, Organization, Permission, Role
+from app.crud.role import role
+from app.schemas.role import RoleResponse
+
+def timed(label: str, fn, repeat: int) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<45} {elapsed * 1000:10.2f} ms  {len(body):>9} bytes")
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the response_model path with projected rows + orjson for read_roles")
+    parser.add_argument("--roles", type=int, default=500)
+    parser.add_argument("--permissions", type=int, default=8, help="Permissions per role")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+
+    organization = Organization(name="Benchmark")
+    db.add(organization)
+    db.flush()
+    org_id = organization.id
+    permissions = [
+        Permission(name=f"perm_{i}", description="benchmark", category="other", organization_id=org_id)
+        for i in range(args.permissions)
+    ]
+    db.add_all(permissions)
+    db.add_all([
+        Role(name=f"role_{i}", description="benchmark", organization_id=org_id, permissions=permissions)
+        for i in range(args.roles)
+    ])
+    db.commit()
+
+    print(f"{args.roles} roles x {args.permissions} permissions on {engine.dialect.name}")
+    adapter = TypeAdapter(List[RoleResponse])
+
+    def response_model_path() -> bytes:
+        # What FastAPI does with response_model: hydrate ORM objects,
+        # validate them, dump to JSON-able data, then json.dumps
+        db.expunge_all()
+        roles = (
+            db.query(Role)
+            .options(selectinload(Role.permissions))
+            .filter(Role.organization_id == org_id)
+            .order_by(Role.id)
+            .limit(args.roles)
+            .all()
+        )
+        content = adapter.dump_python(adapter.validate_python(roles, from_attributes=True), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_path() -> bytes:
+        # FAST_JSON_RESPONSES: projected rows straight into orjson
+        rows = role.get_rows_by_organization(db, organization_id=org_id, limit=args.roles)
+        return orjson.dumps(rows)
+
+    before = timed("ORM + response_model + json", response_model_path, args.repeat)
+    after = timed("projected rows + orjson", fast_path, args.repeat)
+    if orjson.loads(response_model_path()) != orjson.loads(fast_path()):
+        print("warning: the two paths produced different JSON")
+    print(f"speedup: {before / after:.1f}x")
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text
+
+from app.core.deps import _permission_statement
+from app.db.session import engine
+from app.models.associations import role_permissions, user_roles
+from app.models.email_outbox import EmailOutbox
+from app.models.invitation import Invitation
+from app.models.join_request import JoinRequest
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.user_organization import UserOrganization
+
+# Hot lookups that must be served by an index; ids are arbitrary
+HOT_QUERIES = {
+    "membership": select(UserOrganization).where(
+        UserOrganization.user_id == 1, UserOrganization.organization_id == 1
+    ),
+    "members_by_role": select(UserOrganization.user_id).where(
+        UserOrganization.organization_id == 1, UserOrganization.role_id == 1
+    ),
+    "require_permission": _permission_statement(1, 1, "view_members"),
+    "pending_invitation": select(Invitation).where(
+        Invitation.email == "someone@example.com",
+        Invitation.organization_id == 1,
+        Invitation.is_accepted == False,
+        Invitation.expires_at > func.now()
+    ),
+    "pending_invitation_count": select(func.count()).select_from(Invitation).where(
+        Invitation.is_accepted == False,
+        Invitation.expires_at > func.now()
+    ),
+    "invitations_by_organization": select(Invitation).where(Invitation.organization_id == 1),
+    "join_requests_by_status": select(JoinRequest).where(
+        JoinRequest.organization_id == 1, JoinRequest.status == "pending"
+    ),
+    "roles_by_organization": select(Role).where(Role.organization_id == 1),
+    "permissions_by_organization": select(Permission).where(Permission.organization_id == 1),
+    "roles_of_permission": select(role_permissions.c.role_id).where(role_permissions.c.permission_id == 1),
+    "users_of_role": select(user_roles.c.user_id).where(user_roles.c.role_id == 1),
+    "due_emails": select(EmailOutbox.id).where(
+        EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= func.now()
+    ),
+}
+
+def seq_scans(plan: dict) -> list:
+    found = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+def main() -> int:
+    """
+    EXPLAIN every hot query with sequential scans disabled. Postgres then
+    only falls back to a Seq Scan when no index can serve the query, so the
+    check holds regardless of how much data the database has. The test
+    suite runs the same queries against seeded SQLite data
+    (tests/test_query_plans.py).
+    """
+    failures = 0
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for name, statement in HOT_QUERIES.items():
+            sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            tables = seq_scans(plan[0]["Plan"])
+            if tables:
+                failures += 1
+                print(f"FAIL {name}: sequential scan on {', '.join(tables)}")
+            else:
+                print(f"ok   {name}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
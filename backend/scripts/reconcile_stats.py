@@ -0,0 +1,24 @@
+import sys
+import os
+import logging
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.db.uow import UnitOfWork
+from app.utils.stats import reconcile_counters
+
+def main() -> None:
+    """Correct stats counter drift; meant to run periodically, e.g. hourly from cron"""
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        with UnitOfWork(db):
+            corrections = reconcile_counters(db)
+    finally:
+        db.close()
+    for (organization_id, name), delta in sorted(corrections.items()):
+        print(f"organization {organization_id} {name}: {delta:+d}")
+    print(f"Reconciled {len(corrections)} counters")
+
+if __name__ == "__main__":
+    main()
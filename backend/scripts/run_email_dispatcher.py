@@ -0,0 +1,18 @@
+import sys
+import os
+import asyncio
+import logging
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.outbox import run_dispatcher
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    print("Email dispatcher started")
+    try:
+        asyncio.run(run_dispatcher())
+    except KeyboardInterrupt:
+        print("Email dispatcher stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite database before its engines are built
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.cache import principal_cache  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.query_stats import QueryStats, _current  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base import Base, Organization, User  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.permission_index import permission_decisions  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    # Ids restart with every database, so in-process caches must too
+    for cache in (principal_cache, response_cache, permission_decisions):
+        cache.clear()
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def organization(db):
+    organization = Organization(name="Test Organization")
+    db.add(organization)
+    db.commit()
+    return organization
+
+
+@pytest.fixture
+def client(db):
+    # Not entered as a context manager: startup hooks (job recovery, the
+    # activity writer and email dispatcher) stay off
+    return TestClient(app)
+
+
+@pytest.fixture
+def superuser(db):
+    user = User(email="admin@example.com", hashed_password="-", full_name="Admin", is_superuser=True)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(superuser):
+    return {"Authorization": f"Bearer {create_access_token(superuser.id)}"}
+
+
+@pytest.fixture
+def strict_query_stats(monkeypatch):
+    """
+    Count statements as if inside a request, raising NPlusOneDetected once
+    a statement shape repeats more than 3 times
+    """
+    monkeypatch.setattr(settings, "QUERY_NPLUSONE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "QUERY_NPLUSONE_STRICT", True)
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
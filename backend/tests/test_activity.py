@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.config import settings
+from app.db.base import User
+from app.db.session import async_engine
+from app.models.user_organization import UserOrganization
+from app.utils.activity import ActivityBuffer, activity_buffer, flush_activity, log_activity
+
+
+def test_requeue_into_full_buffer_drops_oldest_and_counts_them():
+    buffer = ActivityBuffer(maxlen=4, batch_size=10)
+    for i in range(3):
+        buffer.record({"n": i})
+    batch = buffer.drain(3)
+    # Events recorded while the failed batch was being written
+    for i in range(3, 6):
+        buffer.record({"n": i})
+
+    buffer.requeue(batch)
+
+    assert [entry["n"] for entry in buffer.drain(10)] == [2, 3, 4, 5]
+    assert buffer.dropped == 2
+
+
+def test_flushed_events_are_readable_after_the_member_leaves(db, client, organization, superuser, auth_headers):
+    activity_buffer.drain(len(activity_buffer))
+    member = User(email="leaver@example.com", hashed_password="-", full_name="Leaver")
+    db.add(member)
+    db.flush()
+    db.add(UserOrganization(user_id=superuser.id, organization_id=organization.id))
+    log_activity(db, organization_id=organization.id, user_id=member.id, action="member.invited")
+    log_activity(db, organization_id=organization.id, user_id=member.id, action="member.removed")
+    db.commit()
+
+    async def flush():
+        try:
+            return await flush_activity()
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(flush()) == 2
+
+    response = client.get(
+        f"{settings.API_V1_STR}/organizations/{organization.id}/members/members/{member.id}/activity",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert [event["action"] for event in response.json()] == ["member.removed", "member.invited"]
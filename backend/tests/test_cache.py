@@ -0,0 +1,20 @@
+from app.core.cache import PrincipalCache, TTLCache
+from app.models.user import User
+
+
+def test_ttl_cache_reports_expired_and_evicted_entries():
+    evicted = []
+    cache = TTLCache(maxsize=2, ttl=60, on_evict=lambda key, value: evicted.append(key))
+    cache.set("expired", 1, ttl=0)
+    assert cache.get("expired") is None
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert evicted == ["expired", "a"]
+
+
+def test_principal_cache_index_stays_bounded():
+    cache = PrincipalCache(maxsize=3, ttl=60)
+    for user_id in range(1, 11):
+        cache.store(f"token-{user_id}", User(id=user_id, email=f"user{user_id}@example.com"))
+    assert sorted(cache._tokens_by_user) == [8, 9, 10]
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.core.hashing import PasswordHasher, password_hash_seconds, password_hash_wait_seconds
+
+
+def _count(histogram) -> int:
+    return sum(count for _, _, count in histogram.snapshot().values())
+
+
+def test_run_many_records_hash_and_wait_latency():
+    hasher = PasswordHasher(workers=1, max_queue=4)
+    hashed, waited = _count(password_hash_seconds), _count(password_hash_wait_seconds)
+    try:
+        results = asyncio.run(hasher.run_many(pow, [(2, 10), (3, 3), (5, 2)]))
+    finally:
+        hasher.shutdown()
+    assert results == [1024, 27, 25]
+    assert _count(password_hash_seconds) == hashed + 3
+    assert _count(password_hash_wait_seconds) == waited + 3
+    stats = hasher.stats()
+    assert (stats["running"], stats["queue_depth"], stats["completed"]) == (0, 0, 3)
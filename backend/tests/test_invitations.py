@@ -0,0 +1,24 @@
+from app.core.config import settings
+from app.db.base import EmailOutbox, Invitation, Role
+from app.models.user_organization import UserOrganization
+
+
+def test_invitation_email_carries_the_accept_token(db, client, organization, superuser, auth_headers):
+    admin = Role(name="admin", organization_id=organization.id)
+    db.add(admin)
+    db.flush()
+    db.add(UserOrganization(user_id=superuser.id, organization_id=organization.id, role_id=admin.id))
+    db.commit()
+    url = f"{settings.API_V1_STR}/organizations/{organization.id}/invitations"
+
+    created = client.post(url, json={"email": "invitee@example.com", "role_id": admin.id}, headers=auth_headers)
+    assert created.status_code == 200, created.text
+    resent = client.post(f"{url}/{created.json()['id']}/resend", headers=auth_headers)
+    assert resent.status_code == 200, resent.text
+
+    db.expire_all()
+    token = db.get(Invitation, created.json()["id"]).token
+    payloads = [message.payload for message in db.query(EmailOutbox).order_by(EmailOutbox.id)]
+    assert len(payloads) == 2
+    assert payloads[0]["token"] != token
+    assert payloads[1]["token"] == token
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.job import Job
+from app.models.role import Role
+from app.utils import jobs
+
+
+@pytest.fixture
+def handlers():
+    registered = dict(jobs.JOB_HANDLERS)
+    yield jobs.JOB_HANDLERS
+    jobs.JOB_HANDLERS.clear()
+    jobs.JOB_HANDLERS.update(registered)
+
+
+def _queue(db, organization, kind, **values):
+    job = Job(organization_id=organization.id, kind=kind, params={"count": 3}, **values)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_run_job_claims_once_and_records_progress(db, organization, handlers):
+    calls = []
+
+    @jobs.job_handler("test_count")
+    def count(session, params, progress):
+        calls.append(params)
+        for done in range(1, params["count"] + 1):
+            progress(done, params["count"])
+        return {"counted": params["count"]}
+
+    job_id = _queue(db, organization, "test_count")
+    jobs.run_job(job_id)
+    # A second worker picking up the same id finds it already claimed
+    jobs.run_job(job_id)
+
+    db.expire_all()
+    job = db.get(Job, job_id)
+    assert calls == [{"count": 3}]
+    assert job.status == "succeeded"
+    assert (job.progress_done, job.progress_total) == (3, 3)
+    assert job.result == {"counted": 3}
+    assert job.started_at is not None and job.finished_at is not None
+
+
+def test_failed_job_rolls_back_its_writes(db, organization, handlers):
+    organization_id = organization.id
+
+    @jobs.job_handler("test_fail")
+    def fail(session, params, progress):
+        progress(1)
+        session.add(Role(name="half-done", organization_id=organization_id))
+        session.flush()
+        raise RuntimeError("boom")
+
+    job_id = _queue(db, organization, "test_fail")
+    jobs.run_job(job_id)
+
+    db.expire_all()
+    job = db.get(Job, job_id)
+    assert job.status == "failed"
+    assert job.error == "boom"
+    assert job.progress_done == 1
+    assert db.query(Role).filter(Role.name == "half-done").count() == 0
+
+
+def test_submit_job_waits_for_the_callers_commit(db, organization, handlers, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(jobs._executor, "submit", lambda fn, job_id: submitted.append(job_id))
+    jobs.job_handler("test_noop")(lambda session, params, progress: None)
+
+    job = jobs.submit_job(db, organization_id=organization.id, kind="test_noop", params={})
+    assert submitted == []
+    db.commit()
+    assert submitted == [job.id]
+
+
+def test_recover_jobs_resubmits_queued_and_fails_stale_running(db, organization, handlers, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(jobs._executor, "submit", lambda fn, job_id: submitted.append(job_id))
+    now = datetime.now(timezone.utc)
+    stale = timedelta(seconds=jobs.settings.JOB_STALE_AFTER_SECONDS + 60)
+
+    queued_id = _queue(db, organization, "test_count")
+    stale_id = _queue(db, organization, "test_count", status="running", updated_at=now - stale)
+    live_id = _queue(db, organization, "test_count", status="running", updated_at=now)
+
+    assert jobs.recover_jobs() == 1
+
+    db.expire_all()
+    assert submitted == [queued_id]
+    assert db.get(Job, stale_id).status == "failed"
+    assert db.get(Job, live_id).status == "running"
@@ -0,0 +1,118 @@
+from sqlalchemy.exc import IntegrityError
+
+from app.api.v1.endpoints import members
+from app.core.config import settings
+from app.db.base import Organization, Role, User
+from app.models.user_organization import UserOrganization
+from app.utils.pagination import encode_cursor
+
+
+def _organization_with_members(db, name, caller, others):
+    """An organization whose members are `caller` plus `others` new users"""
+    organization = Organization(name=name)
+    db.add(organization)
+    db.flush()
+    role = Role(name=f"{name} member", organization_id=organization.id)
+    users = [
+        User(email=f"{name}-{i}@example.com", hashed_password="-", full_name=f"Member {i}")
+        for i in range(others)
+    ]
+    db.add(role)
+    db.add_all(users)
+    db.flush()
+    db.add_all([
+        UserOrganization(user_id=user.id, organization_id=organization.id, role_id=role.id)
+        for user in (caller, *users)
+    ])
+    db.commit()
+    return organization.id
+
+
+def _list_members(client, headers, organization_id):
+    """Members returned and statements executed by a warm list_members call"""
+    url = f"{settings.API_V1_STR}/organizations/{organization_id}/members/"
+    # The first request compiles the caller's permission mask
+    client.get(url, headers=headers)
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(response.json()), int(response.headers["X-DB-Query-Count"])
+
+
+def test_list_members_statement_count_does_not_grow_with_members(db, client, superuser, auth_headers):
+    single = _organization_with_members(db, "single", superuser, others=0)
+    many = _organization_with_members(db, "many", superuser, others=24)
+
+    single_members, single_statements = _list_members(client, auth_headers, single)
+    many_members, many_statements = _list_members(client, auth_headers, many)
+
+    assert (single_members, many_members) == (1, 25)
+    assert many_statements == single_statements
+
+
+def test_list_members_rejects_cursor_without_position(db, client, superuser, auth_headers):
+    organization_id = _organization_with_members(db, "cursor", superuser, others=0)
+    cursor = encode_cursor({"sort_by": "created_at", "order": "desc", "id": superuser.id})
+    response = client.get(
+        f"{settings.API_V1_STR}/organizations/{organization_id}/members/",
+        params={"cursor": cursor},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_deactivate_skips_members_of_other_organizations(db, client, superuser, auth_headers):
+    organization_id = _organization_with_members(db, "home", superuser, others=2)
+    shared, exclusive = (
+        db.query(User).filter(User.email.in_(["home-0@example.com", "home-1@example.com"]))
+        .order_by(User.email).all()
+    )
+    other = Organization(name="elsewhere")
+    db.add(other)
+    db.flush()
+    db.add(UserOrganization(user_id=shared.id, organization_id=other.id))
+    db.commit()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/organizations/{organization_id}/members/bulk",
+        json={"member_ids": [shared.id, exclusive.id], "action": "deactivate"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["results"] == {str(shared.id): "other_memberships", str(exclusive.id): "affected"}
+    db.expire_all()
+    assert (shared.is_active, exclusive.is_active) == (True, False)
+
+
+def test_import_retries_a_failing_batch_row_by_row(db, client, superuser, auth_headers, monkeypatch):
+    organization_id = _organization_with_members(db, "import", superuser, others=0)
+    enqueue_email = members.enqueue_email
+
+    def conflicting_enqueue(session, kind, recipient, **payload):
+        if recipient == "taken@example.com":
+            raise IntegrityError("INSERT", {}, Exception("duplicate key"))
+        return enqueue_email(session, kind, recipient, **payload)
+
+    monkeypatch.setattr(members, "enqueue_email", conflicting_enqueue)
+    role = db.query(Role).filter(Role.organization_id == organization_id).one()
+    csv = "email\nfirst@example.com\ntaken@example.com\nsecond@example.com\n"
+
+    response = client.post(
+        f"{settings.API_V1_STR}/organizations/{organization_id}/members/import",
+        params={"default_role_id": role.id},
+        files={"file": ("members.csv", csv, "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["created_users"], report["added_members"]) == (2, 2)
+    assert report["skipped"] == [{"row": 3, "email": "taken@example.com", "reason": "conflict"}]
+
+    db.expire_all()
+    emails = {
+        email for (email,) in db.query(User.email)
+        .join(UserOrganization, UserOrganization.user_id == User.id)
+        .filter(UserOrganization.organization_id == organization_id)
+    }
+    assert emails == {superuser.email, "first@example.com", "second@example.com"}
+    assert db.query(User).filter(User.email == "taken@example.com").count() == 0
@@ -0,0 +1,21 @@
+from app.api import metrics
+
+
+def test_monotonic_totals_are_exported_as_counters(db, client):
+    body = client.get("/metrics").text
+    for name in (
+        "cache_evictions_total",
+        "password_hash_rejected_total",
+        "activity_dropped_events_total",
+        "activity_written_events_total",
+    ):
+        assert f"# TYPE {name} counter" in body
+
+
+def test_outbox_depth_is_cached_between_scrapes(db, client):
+    metrics._outbox_depth.clear()
+    first = client.get("/metrics")
+    second = client.get("/metrics")
+    assert "email_outbox_pending 0" in second.text
+    assert int(first.headers["X-DB-Query-Count"]) == 1
+    assert int(second.headers["X-DB-Query-Count"]) == 0
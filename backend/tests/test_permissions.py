@@ -0,0 +1,52 @@
+from app.core.config import settings
+from app.db.base import MembershipPermissionMask, Permission, Role, User
+from app.db.session import SessionLocal
+from app.models.user_organization import UserOrganization
+from app.utils.permission_index import _compile_organization, _store_masks, cached_permission, effective_permission
+
+
+def test_renamed_permission_stops_granting_its_old_name(db, client, organization, superuser, auth_headers):
+    superuser.organization_id = organization.id
+    permission = Permission(name="view_members", category="members", organization_id=organization.id)
+    role = Role(name="viewer", organization_id=organization.id, permissions=[permission])
+    member = User(email="member@example.com", hashed_password="-", full_name="Member")
+    db.add_all([role, member])
+    db.flush()
+    db.add(UserOrganization(user_id=member.id, organization_id=organization.id, role_id=role.id))
+    db.commit()
+    member_id, organization_id, permission_id = member.id, organization.id, permission.id
+    assert cached_permission(db, member_id, organization_id, "view_members") is True
+    db.commit()
+
+    response = client.put(
+        f"{settings.API_V1_STR}/organizations/{organization_id}/permissions/{permission_id}",
+        json={"name": "view_member_list"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    fresh = SessionLocal()
+    try:
+        assert cached_permission(fresh, member_id, organization_id, "view_members") is False
+        assert cached_permission(fresh, member_id, organization_id, "view_member_list") is True
+    finally:
+        fresh.close()
+
+
+def test_compiling_over_a_concurrently_stored_mask_updates_it(db, organization):
+    member = User(email="member@example.com", hashed_password="-", full_name="Member")
+    role = Role(name="viewer", organization_id=organization.id, permissions=[
+        Permission(name="view_members", category="members", organization_id=organization.id)
+    ])
+    db.add_all([member, role])
+    db.flush()
+    db.add(UserOrganization(user_id=member.id, organization_id=organization.id, role_id=role.id))
+    db.commit()
+
+    # Another request's mask for the same membership, written meanwhile
+    _store_masks(db, organization.id, {member.id: 0})
+    _compile_organization(db, organization.id)
+    db.commit()
+
+    assert db.query(MembershipPermissionMask).count() == 1
+    assert effective_permission(db, member.id, organization.id, "view_members") is True
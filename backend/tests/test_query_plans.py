@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.db.base import EmailOutbox, Invitation, JoinRequest, Organization, Permission, Role, User
+from app.models.associations import role_permissions, user_roles
+from app.models.user_organization import UserOrganization
+from scripts.check_query_plans import HOT_QUERIES
+
+ORGANIZATIONS = 20
+MEMBERS_PER_ORGANIZATION = 100
+ROLES_PER_ORGANIZATION = 5
+
+
+@pytest.fixture
+def representative_data(db):
+    """A few thousand rows per hot table, then ANALYZE so the planner sees them"""
+    later = datetime.utcnow() + timedelta(days=7)
+    members = ORGANIZATIONS * MEMBERS_PER_ORGANIZATION
+    roles = ORGANIZATIONS * ROLES_PER_ORGANIZATION
+    db.execute(insert(Organization), [{"id": o, "name": f"org-{o}"} for o in range(1, ORGANIZATIONS + 1)])
+    db.execute(insert(User), [
+        {"id": u, "email": f"user-{u}@example.com", "hashed_password": "-"} for u in range(1, members + 1)
+    ])
+    db.execute(insert(Role), [
+        {"id": r, "name": f"role-{r}", "organization_id": (r - 1) // ROLES_PER_ORGANIZATION + 1}
+        for r in range(1, roles + 1)
+    ])
+    db.execute(insert(Permission), [
+        {"id": r, "name": f"permission-{r}", "organization_id": (r - 1) // ROLES_PER_ORGANIZATION + 1}
+        for r in range(1, roles + 1)
+    ])
+    db.execute(insert(role_permissions), [{"role_id": r, "permission_id": r} for r in range(1, roles + 1)])
+    db.execute(insert(UserOrganization), [
+        {
+            "user_id": u,
+            "organization_id": (u - 1) // MEMBERS_PER_ORGANIZATION + 1,
+            "role_id": (u - 1) // MEMBERS_PER_ORGANIZATION * ROLES_PER_ORGANIZATION + u % ROLES_PER_ORGANIZATION + 1,
+        }
+        for u in range(1, members + 1)
+    ])
+    db.execute(insert(user_roles), [
+        {"user_id": u, "role_id": (u - 1) // MEMBERS_PER_ORGANIZATION * ROLES_PER_ORGANIZATION + 1}
+        for u in range(1, members + 1)
+    ])
+    db.execute(insert(Invitation), [
+        {
+            "email": f"invitee-{i}@example.com",
+            "token": f"token-{i}",
+            "organization_id": i % ORGANIZATIONS + 1,
+            "invited_by_id": 1,
+            "is_accepted": i % 2 == 0,
+            "expires_at": later,
+        }
+        for i in range(members)
+    ])
+    db.execute(insert(JoinRequest), [
+        {"user_id": u, "organization_id": u % ORGANIZATIONS + 1, "status": ("pending", "approved", "rejected")[u % 3]}
+        for u in range(1, members + 1)
+    ])
+    db.execute(insert(EmailOutbox), [
+        {"kind": "invitation", "recipient": f"invitee-{i}@example.com", "payload": {}, "status": "sent"}
+        for i in range(members)
+    ])
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_is_served_by_an_index(db, representative_data, name):
+    sql = str(HOT_QUERIES[name].compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+    plan = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    # SQLite reports full table scans as "SCAN <table>" without an index
+    scans = [step for step in plan if step.startswith("SCAN") and "INDEX" not in step]
+    assert not scans, f"{name}: {plan}"
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.query_stats import NPlusOneDetected, statement_shape
+from app.db.base import Permission, Role
+
+
+@pytest.fixture
+def roles(db, organization):
+    permission = Permission(name="view_members", category="members", organization_id=organization.id)
+    db.add_all([
+        Role(name=f"role_{i}", organization_id=organization.id, permissions=[permission])
+        for i in range(6)
+    ])
+    db.commit()
+    db.expunge_all()
+
+
+def test_statement_shape_collapses_bind_lists():
+    assert statement_shape("SELECT 1 WHERE id IN (?, ?, ?)") == statement_shape("SELECT  1\nWHERE id IN (?, ?)")
+
+
+def test_strict_mode_raises_on_n_plus_one(db, roles, strict_query_stats):
+    with pytest.raises(NPlusOneDetected):
+        for role in db.scalars(select(Role)).all():
+            role.permissions  # lazy load per role
+
+
+def test_strict_mode_allows_eager_loading(db, roles, strict_query_stats):
+    loaded = db.scalars(select(Role).options(selectinload(Role.permissions))).all()
+    assert all(role.permissions for role in loaded)
+    assert not strict_query_stats.flagged
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.utils.smtp import SMTPPool
+
+
+class FakeClient:
+    is_connected = True
+
+    def __init__(self):
+        self.closed = False
+
+    async def send_message(self, message):
+        pass
+
+    async def quit(self):
+        raise OSError("connection reset")
+
+    def close(self):
+        self.closed = True
+
+
+def test_each_event_loop_gets_its_own_connections(monkeypatch):
+    pool = SMTPPool(size=1)
+    clients = []
+
+    async def connect():
+        clients.append(FakeClient())
+        return clients[-1]
+
+    monkeypatch.setattr(pool, "_connect", connect)
+
+    async def send_twice():
+        await pool.send(None)
+        await pool.send(None)
+        await pool.close()
+
+    # The API's loop and a dispatcher's asyncio.run, one after the other
+    asyncio.run(send_twice())
+    asyncio.run(send_twice())
+
+    assert len(clients) == 2
+    assert all(client.closed for client in clients)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.db.base import Invitation, Organization, Role, StatsCounter
+from app.models.stats_counter import GLOBAL_SCOPE
+from app.models.user_organization import UserOrganization
+from app.utils.stats import read_counters, reconcile_counters
+
+
+def test_global_totals_are_summed_without_a_shared_row(db):
+    first, second = Organization(name="first"), Organization(name="second")
+    db.add_all([first, second])
+    db.flush()
+    db.add_all([
+        Role(name="first admin", organization_id=first.id),
+        Role(name="first member", organization_id=first.id),
+        Role(name="second admin", organization_id=second.id),
+    ])
+    db.commit()
+
+    assert read_counters(db, first.id)["roles"] == 2
+    assert read_counters(db)["roles"] == 3
+    assert read_counters(db)["organizations"] == 2
+    assert db.get(StatsCounter, (GLOBAL_SCOPE, "roles")) is None
+    assert reconcile_counters(db) == {}
+
+
+def test_pending_invitations_leave_out_expired_and_accepted_ones(db, client, organization, superuser, auth_headers):
+    db.add(UserOrganization(user_id=superuser.id, organization_id=organization.id))
+    now = datetime.utcnow()
+    for email, expires_at, is_accepted in [
+        ("live@example.com", now + timedelta(days=1), False),
+        ("expired@example.com", now - timedelta(days=1), False),
+        ("accepted@example.com", now + timedelta(days=1), True),
+    ]:
+        db.add(Invitation(
+            email=email, token=email, organization_id=organization.id, invited_by_id=superuser.id,
+            expires_at=expires_at, is_accepted=is_accepted
+        ))
+    db.commit()
+    url = f"{settings.API_V1_STR}/dashboard/stats"
+
+    for params in [{}, {"organization_id": organization.id}]:
+        response = client.get(url, params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        assert response.json()["pending_invitations"] == 1
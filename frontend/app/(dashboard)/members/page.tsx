@@ -6,7 +6,7 @@ import { Users, Search, Filter, MoreVertical, ChevronDown, Plus, Activity, Shiel
 import { useRouter } from 'next/navigation'
 import { useState, useCallback, useTransition } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import api from '@/lib/api'
+import api, { getAllPages } from '@/lib/api'
 import { Button } from '@/components/ui/button'
 import {
   Dialog,
@@ -98,10 +98,7 @@ export default function MembersPage() {
   // Fetch members
   const { data: members = [], isLoading: isLoadingMembers } = useQuery<Member[]>({
     queryKey: ['members', currentOrg?.id],
-    queryFn: async () => {
-      const response = await api.get(`/organizations/${currentOrg?.id}/members`)
-      return response.data
-    },
+    queryFn: () => getAllPages<Member>(`/organizations/${currentOrg?.id}/members`),
     enabled: !!currentOrg
   })
 
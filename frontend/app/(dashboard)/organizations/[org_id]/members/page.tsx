@@ -6,7 +6,7 @@ import { Users, Search, Filter, MoreVertical, Plus, Mail, X, Clock } from 'lucid
 import { useRouter } from 'next/navigation'
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import api from '@/lib/api'
+import api, { getAllPages } from '@/lib/api'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Label } from '@/components/ui/label'
@@ -63,10 +63,7 @@ export default function MembersPage() {
   // Fetch members
   const { data: members = [], isLoading: isLoadingMembers } = useQuery<Member[]>({
     queryKey: ['members', currentOrg?.id],
-    queryFn: async () => {
-      const response = await api.get(`/organizations/${currentOrg?.id}/members`)
-      return response.data
-    },
+    queryFn: () => getAllPages<Member>(`/organizations/${currentOrg?.id}/members`),
     enabled: !!currentOrg
   })
 
@@ -54,4 +54,16 @@ export const getOrganization = async (orgId: string) => {
   return response.data;
 };
 
+// Follow the X-Next-Cursor header through a keyset-paginated list
+export const getAllPages = async <T>(url: string, limit = 500): Promise<T[]> => {
+  const rows: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get<T[]>(url, { params: { limit, cursor } });
+    rows.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return rows;
+};
+
 export default api;